@@ -1,12 +1,10 @@
 from typing import Callable, List
 import logging
 
-from fastapi import APIRouter, HTTPException, Body, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, HTTPException, Body
 
 from src.core.exceptions import NotFoundException
-from src.models.database import Project, Conversation, Message, Document, get_db
+from src.models.database import Project
 
 logger = logging.getLogger(__name__)
 from src.models.schemas import ProjectCreate, ProjectResponse, ProjectUpdate
@@ -75,32 +73,17 @@ def create_project_routes(get_repo: Callable[[], ProjectRepository]) -> APIRoute
         },
         tags=["Projects"],
     )
-    async def list_projects(db: Session = Depends(get_db)):
+    async def list_projects():
         """Get all projects for the current user."""
         try:
             logger.info("Fetching all projects for user 1")
             repo = get_repo()
-            projects = repo.find_by_user(1)
+            # Stats come back with each project in a single query
+            projects = repo.find_by_user_with_counts(1)
             logger.info(f"Found {len(projects)} projects")
             
-            # Compute stats for each project
             project_responses = []
-            for p in projects:
-                # Count conversations for this project
-                conv_count = db.query(func.count(Conversation.id)).filter(
-                    Conversation.project_id == p.id
-                ).scalar() or 0
-                
-                # Count messages across all conversations in this project
-                msg_count = db.query(func.count(Message.id)).join(Conversation).filter(
-                    Conversation.project_id == p.id
-                ).scalar() or 0
-                
-                # Count documents for this project
-                doc_count = db.query(func.count(Document.id)).filter(
-                    Document.project_id == p.id
-                ).scalar() or 0
-                
+            for p, conv_count, msg_count, doc_count in projects:
                 # Create response with stats
                 project_dict = {
                     "id": p.id,
@@ -7,7 +7,7 @@ from src.models.database import Project, Conversation, Message, Document
 from src.models.schemas import ConversationStatsResponse
 from src.repositories.project_repository import ProjectRepository
 from src.repositories.conversation_repository import ConversationRepository
-from src.utils.token_counter import calculate_context_usage, estimate_tokens
+from src.utils.token_counter import calculate_context_usage, estimate_tokens, estimate_tokens_batch
 
 
 def create_stats_routes(
@@ -139,6 +139,10 @@ def create_stats_routes(
             
             # Calculate token usage
             messages_tokens = sum(msg.token_count or 0 for msg in messages)
+            # Rows saved without a count are encoded together in one batch
+            uncounted = [msg.content for msg in messages if msg.token_count is None]
+            if uncounted:
+                messages_tokens += sum(estimate_tokens_batch(uncounted))
             system_prompt_tokens = estimate_tokens(project.system_prompt) if project and project.system_prompt else 0
             
             # Estimate document context tokens (assume average of 500 tokens per document in context)
@@ -154,11 +158,11 @@ def create_stats_routes(
             return ConversationStatsResponse(
                 conversation_id=conversation_id,
                 message_count=len(messages),
-                total_tokens=stats["total_tokens"],
-                max_tokens=stats["max_tokens"],
-                usage_percentage=stats["usage_percentage"],
-                remaining_tokens=stats["remaining_tokens"],
-                is_near_limit=stats["is_near_limit"],
+                total_tokens=stats.total_tokens,
+                max_tokens=stats.max_tokens,
+                usage_percentage=stats.usage_percentage,
+                remaining_tokens=stats.remaining_tokens,
+                is_near_limit=stats.is_near_limit,
                 document_count=document_count
             )
         except HTTPException:
@@ -31,6 +31,7 @@ from src.services.chat_service import ChatService
 from src.services.document_service import DocumentService
 from src.services.export_service import ExportService
 from src.services.voice_service import VoiceService
+from src.utils.token_counter import preload_encoding
 
 
 # Set up structured logging
@@ -52,6 +53,12 @@ async def lifespan(app: FastAPI):
     create_tables()
     logger.info("✅ Database tables ready")
     
+    # Load the tokenizer now so a cold-cache download doesn't block a chat request
+    if preload_encoding():
+        logger.info("✅ Token encoding loaded")
+    else:
+        logger.warning("⚠️ Token encoding unavailable, using character estimate")
+    
     yield
     logger.info("👋 Shutting down AI Study Buddy...")
 
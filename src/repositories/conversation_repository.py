@@ -1,6 +1,7 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.interfaces import ORMOption
 
 from src.models.database import Conversation
 
@@ -15,8 +16,13 @@ class ConversationRepository:
         self.db.refresh(conversation)
         return conversation
 
-    def find_by_id(self, conversation_id: int) -> Optional[Conversation]:
-        return self.db.query(Conversation).filter(Conversation.id == conversation_id).first()
+    def find_by_id(self, conversation_id: int, options: Sequence[ORMOption] = ()) -> Optional[Conversation]:
+        return (
+            self.db.query(Conversation)
+            .options(*options)
+            .filter(Conversation.id == conversation_id)
+            .first()
+        )
 
     def find_by_project(self, project_id: int) -> List[Conversation]:
         return (
@@ -1,6 +1,7 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence
 
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.interfaces import ORMOption
 
 from src.models.database import Document
 
@@ -15,11 +16,11 @@ class DocumentRepository:
         self.db.refresh(document)
         return document
 
-    def find_by_id(self, document_id: int) -> Optional[Document]:
-        return self.db.query(Document).filter(Document.id == document_id).first()
+    def find_by_id(self, document_id: int, options: Sequence[ORMOption] = ()) -> Optional[Document]:
+        return self.db.query(Document).options(*options).filter(Document.id == document_id).first()
 
-    def find_by_project(self, project_id: int) -> List[Document]:
-        return self.db.query(Document).filter(Document.project_id == project_id).all()
+    def find_by_project(self, project_id: int, options: Sequence[ORMOption] = ()) -> List[Document]:
+        return self.db.query(Document).options(*options).filter(Document.project_id == project_id).all()
 
     def update(self, document: Document) -> Document:
         self.db.commit()
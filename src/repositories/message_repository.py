@@ -24,6 +24,26 @@ class MessageRepository:
         self.db.refresh(message)
         return message
 
+    def bulk_create(self, messages: List[Message]) -> List[Message]:
+        self.db.add_all(messages)
+        
+        # Touch each affected conversation once, as create() does per message
+        conversation_ids = {message.conversation_id for message in messages}
+        if conversation_ids:
+            now = datetime.utcnow()
+            for conversation in self.db.query(Conversation).filter(
+                Conversation.id.in_(conversation_ids)
+            ):
+                conversation.updated_at = now
+        
+        self.db.flush()
+        message_ids = [message.id for message in messages]
+        self.db.commit()
+        
+        # One reload for the whole batch instead of a refresh per expired message
+        self.db.query(Message).filter(Message.id.in_(message_ids)).populate_existing().all()
+        return messages
+
     def find_by_id(self, message_id: int) -> Optional[Message]:
         return self.db.query(Message).filter(Message.id == message_id).first()
 
@@ -1,8 +1,10 @@
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.orm.interfaces import ORMOption
 
-from src.models.database import Project
+from src.models.database import Conversation, Document, Message, Project
 
 
 class ProjectRepository:
@@ -15,8 +17,8 @@ class ProjectRepository:
         self.db.refresh(project)
         return project
 
-    def find_by_id(self, project_id: int) -> Optional[Project]:
-        return self.db.query(Project).filter(Project.id == project_id).first()
+    def find_by_id(self, project_id: int, options: Sequence[ORMOption] = ()) -> Optional[Project]:
+        return self.db.query(Project).options(*options).filter(Project.id == project_id).first()
 
     def find_by_user(self, user_id: int) -> List[Project]:
         return (
@@ -26,6 +28,37 @@ class ProjectRepository:
             .all()
         )
 
+    def find_by_user_with_counts(self, user_id: int) -> List[Tuple[Project, int, int, int]]:
+        """
+        Return (project, conversation_count, message_count, document_count)
+        for each of a user's projects, newest first.
+        The counts are correlated subqueries, so the whole list is one query
+        instead of three COUNT queries per project.
+        """
+        conversation_count = (
+            select(func.count(Conversation.id))
+            .where(Conversation.project_id == Project.id)
+            .scalar_subquery()
+        )
+        message_count = (
+            select(func.count(Message.id))
+            .join(Conversation, Message.conversation_id == Conversation.id)
+            .where(Conversation.project_id == Project.id)
+            .scalar_subquery()
+        )
+        document_count = (
+            select(func.count(Document.id))
+            .where(Document.project_id == Project.id)
+            .scalar_subquery()
+        )
+        rows = (
+            self.db.query(Project, conversation_count, message_count, document_count)
+            .filter(Project.user_id == user_id)
+            .order_by(Project.updated_at.desc())
+            .all()
+        )
+        return [tuple(row) for row in rows]
+
     def find_all(self) -> List[Project]:
         return self.db.query(Project).all()
 
@@ -35,7 +68,12 @@ class ProjectRepository:
         return project
 
     def delete(self, project_id: int) -> bool:
-        project = self.find_by_id(project_id)
+        # The ORM cascade needs every child loaded; fetch them up front rather
+        # than lazily loading each conversation's messages one at a time
+        project = self.find_by_id(project_id, options=(
+            selectinload(Project.conversations).selectinload(Conversation.messages),
+            selectinload(Project.documents),
+        ))
         if project:
             self.db.delete(project)
             self.db.commit()
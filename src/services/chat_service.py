@@ -17,7 +17,7 @@ from src.repositories.conversation_repository import ConversationRepository
 from src.repositories.message_repository import MessageRepository
 from src.repositories.project_repository import ProjectRepository
 from src.utils.token_counter import estimate_tokens
-from src.utils.query_classifier import classify_query
+from src.utils.query_classifier import classify_query_with_target
 from src.utils.hallucination_detector import detect_hallucination_risk, prepend_warning
 from src.tools.registry import get_tool_registry
 
@@ -46,12 +46,13 @@ class ChatService:
             title=request.message[:AUTO_TITLE_MAX_LENGTH] if not request.conversation_id else None,
         )
 
+        user_tokens = estimate_tokens(request.message)
         user_message = Message(
             conversation_id=conversation.id,
             role="user",
             content=request.message,
             message_type="text",
-            token_count=estimate_tokens(request.message),
+            token_count=user_tokens,
         )
         saved_user_message = self.message_repo.create(user_message)
 
@@ -83,17 +84,19 @@ class ChatService:
             model=request.model
         )
 
+        assistant_tokens = estimate_tokens(ai_response)
         assistant_message = Message(
             conversation_id=conversation.id,
             role="assistant",
             content=ai_response,
             message_type="text",
-            token_count=estimate_tokens(ai_response),
+            token_count=assistant_tokens,
         )
         saved_assistant_message = self.message_repo.create(assistant_message)
         
-        # Update conversation total tokens
-        conversation.total_tokens = conversation.total_tokens + estimate_tokens(request.message) + estimate_tokens(ai_response)
+        # Update conversation total tokens from the locals; the saved messages
+        # are expired by the commit and reading them would refresh from the DB
+        conversation.total_tokens = conversation.total_tokens + user_tokens + assistant_tokens
         self.conversation_repo.update(conversation)
 
         # Generate AI title for new conversations after first exchange
@@ -136,12 +139,13 @@ class ChatService:
             if tools:
                 logger.info(f"🔧 Tools: Enabled {len(tools)} tools: {enabled_tool_names}")
         
-        # Classify query for logging only (tools passed via bind_tools, not prompt)
-        query_type, tool_requirement = classify_query(message)
+        # Classify query (tools passed via bind_tools, not prompt); URL lookups also get
+        # their search target from the same match, so the message is only scanned once
+        (query_type, tool_requirement), search_target = classify_query_with_target(message)
         logger.info(f"📋 Query classified as: {query_type.value}, requirement: {tool_requirement.value}")
         
         # ===== FORCE WEB SEARCH FOR URL QUERIES =====
-        from ..utils.query_classifier import detect_url_patterns, extract_url_or_domain, QueryType, ToolRequirement
+        from ..utils.query_classifier import detect_url_patterns, QueryType, ToolRequirement
         
         if (query_type == QueryType.URL_LOOKUP and 
             tool_requirement == ToolRequirement.REQUIRED and 
@@ -149,8 +153,6 @@ class ChatService:
             
             logger.info(f"🌐 URL detected - forcing web_search before LLM processing")
             
-            # Extract domain/URL for search
-            search_target = extract_url_or_domain(message)
             logger.info(f"🔍 Extracted search target: {search_target}")
             
             # Execute web_search immediately
@@ -290,12 +292,13 @@ class ChatService:
             if tools:
                 logger.info(f"🔧 Tools: Enabled {len(tools)} tools: {enabled_tool_names}")
         
-        # Classify query for logging only (tools passed via bind_tools, not prompt)
-        query_type, tool_requirement = classify_query(message)
+        # Classify query (tools passed via bind_tools, not prompt); URL lookups also get
+        # their search target from the same match, so the message is only scanned once
+        (query_type, tool_requirement), search_target = classify_query_with_target(message)
         logger.info(f"📋 Query classified as: {query_type.value}, requirement: {tool_requirement.value}")
         
         # ===== FORCE WEB SEARCH FOR URL QUERIES =====
-        from ..utils.query_classifier import detect_url_patterns, extract_url_or_domain, QueryType, ToolRequirement
+        from ..utils.query_classifier import detect_url_patterns, QueryType, ToolRequirement
         
         if (query_type == QueryType.URL_LOOKUP and 
             tool_requirement == ToolRequirement.REQUIRED and 
@@ -303,8 +306,6 @@ class ChatService:
             
             logger.info(f"🌐 URL detected - forcing web_search before LLM processing")
             
-            # Extract domain/URL for search
-            search_target = extract_url_or_domain(message)
             logger.info(f"🔍 Extracted search target: {search_target}")
             
             # Yield structured status message (matches tool loop format)
@@ -680,12 +681,13 @@ class ChatService:
             title=request.message[:AUTO_TITLE_MAX_LENGTH] if not request.conversation_id else None,
         )
 
+        user_tokens = estimate_tokens(request.message)
         user_message = Message(
             conversation_id=conversation.id,
             role="user",
             content=request.message,
             message_type="text",
-            token_count=estimate_tokens(request.message),
+            token_count=user_tokens,
         )
         saved_user_message = self.message_repo.create(user_message)
 
@@ -719,17 +721,19 @@ class ChatService:
                 full_response += chunk
                 yield f"data: {json.dumps({'chunk': chunk})}\n\n"
         
+        assistant_tokens = estimate_tokens(full_response)
         assistant_message = Message(
             conversation_id=conversation.id,
             role="assistant",
             content=full_response,
             message_type="text",
-            token_count=estimate_tokens(full_response),
+            token_count=assistant_tokens,
         )
         saved_assistant_message = self.message_repo.create(assistant_message)
         
-        # Update conversation total tokens
-        conversation.total_tokens = conversation.total_tokens + estimate_tokens(request.message) + estimate_tokens(full_response)
+        # Update conversation total tokens from the locals; the saved messages
+        # are expired by the commit and reading them would refresh from the DB
+        conversation.total_tokens = conversation.total_tokens + user_tokens + assistant_tokens
         self.conversation_repo.update(conversation)
         
         # Generate AI title for new conversations after first exchange
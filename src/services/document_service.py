@@ -1,6 +1,6 @@
 import os
 from pathlib import Path
-from typing import BinaryIO, List
+from typing import BinaryIO, Callable, List
 
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
@@ -10,12 +10,19 @@ from src.core.exceptions import DocumentProcessingError
 from src.core.interfaces import IVectorStore
 from src.models.database import Document
 from src.repositories.document_repository import DocumentRepository
+from src.utils.document_processor import extract_text
 
 
 class DocumentService:
-    def __init__(self, document_repo: DocumentRepository, vector_store: IVectorStore):
+    def __init__(
+        self,
+        document_repo: DocumentRepository,
+        vector_store: IVectorStore,
+        text_extractor: Callable[[bytes, str, str], str] = extract_text,
+    ):
         self.document_repo = document_repo
         self.vector_store = vector_store
+        self.text_extractor = text_extractor
         self.upload_dir = Path(settings.UPLOAD_DIR)
         self.upload_dir.mkdir(parents=True, exist_ok=True)
 
@@ -64,13 +71,12 @@ class DocumentService:
 
     async def _process_and_index_document(self, document: Document, content: bytes):
         try:
-            from src.utils.document_processor import extract_text
             import logging
             
             logger = logging.getLogger(__name__)
             logger.info(f"Starting indexing for document {document.id}: {document.filename}")
             
-            text = extract_text(content, document.file_type, document.filename)
+            text = self.text_extractor(content, document.file_type, document.filename)
             logger.info(f"Extracted {len(text)} characters from {document.filename}")
             
             chunks = self._chunk_text(text)
@@ -143,8 +149,7 @@ class DocumentService:
             with open(document.file_path, 'rb') as f:
                 content = f.read()
             
-            from src.utils.document_processor import extract_text
-            text = extract_text(content, document.file_type, document.filename)
+            text = self.text_extractor(content, document.file_type, document.filename)
             
             prompt = f"""Please provide a concise summary of the following document:
 
@@ -2,13 +2,27 @@
 Web search tool using SearXNG self-hosted metasearch engine.
 """
 
+from itertools import compress
 from typing import Any, Dict, List
+from urllib.parse import urlsplit
 import re
 import aiohttp
 import tldextract
 from .base import Tool, ToolResult
 
 
+# Domain or URL inside a search query; compiled once at import
+_DOMAIN_RE = re.compile(r'(?:https?://)?(?:www\.)?([a-zA-Z0-9-]+\.[a-zA-Z]{2,}(?:\.[a-zA-Z]{2,})?)')
+
+
+def _url_host(url: str) -> str:
+    """Lowercased host of a URL, or "" if it has none or can't be parsed."""
+    try:
+        return urlsplit(url).hostname or ""
+    except ValueError:
+        return ""
+
+
 class WebSearchTool(Tool):
     """
     Web search tool that searches the internet using SearXNG metasearch engine.
@@ -56,9 +70,7 @@ class WebSearchTool(Tool):
         Returns:
             (has_domain, domain) tuple
         """
-        # Regex for domains/URLs
-        url_pattern = r'(?:https?://)?(?:www\.)?([a-zA-Z0-9-]+\.[a-zA-Z]{2,}(?:\.[a-zA-Z]{2,})?)'
-        match = re.search(url_pattern, query)
+        match = _DOMAIN_RE.search(query)
         
         if match:
             extracted = self.tld_extractor(match.group(0))
@@ -79,15 +91,13 @@ class WebSearchTool(Tool):
         Returns:
             Filtered list of results
         """
-        filtered = []
-        for result in results:
-            url = result.get('url', '')
-            if url:
-                extracted = self.tld_extractor(url)
-                result_domain = extracted.registered_domain
-                if result_domain == target_domain:
-                    filtered.append(result)
-        return filtered
+        # target_domain is already a registered domain, so a host belongs to it
+        # exactly when it equals it or is a subdomain of it; no tldextract needed
+        target_domain = target_domain.lower()
+        subdomain_suffix = "." + target_domain
+        hosts = [_url_host(result.get('url', '')) for result in results]
+        mask = [host == target_domain or host.endswith(subdomain_suffix) for host in hosts]
+        return list(compress(results, mask))
     
     async def execute(self, query: str, num_results: int = 5, **kwargs) -> ToolResult:
         """
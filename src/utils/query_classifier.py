@@ -2,7 +2,8 @@
 Query classification to determine when tools are mandatory vs optional.
 """
 from enum import Enum
-from typing import Tuple
+from functools import lru_cache
+from typing import Optional, Tuple
 import re
 
 
@@ -24,88 +25,189 @@ class ToolRequirement(Enum):
     NONE = "none"
 
 
-def detect_url_patterns(message: str) -> bool:
+# Prebuilt classify_query() results, returned as-is instead of allocating a tuple per call
+_R_URL = (QueryType.URL_LOOKUP, ToolRequirement.REQUIRED)
+_R_SEARCH = (QueryType.WEB_SEARCH_REQUIRED, ToolRequirement.REQUIRED)
+_R_CURRENT = (QueryType.CURRENT_EVENTS, ToolRequirement.RECOMMENDED)
+_R_CALC = (QueryType.CALCULATION, ToolRequirement.REQUIRED)
+_R_CREATIVE = (QueryType.CREATIVE, ToolRequirement.NONE)
+_R_GENERAL = (QueryType.GENERAL_KNOWLEDGE, ToolRequirement.OPTIONAL)
+
+
+# URL/domain patterns, checked in priority order by detect_url().
+# Patterns are lowercase-only; callers lowercase the message once up front.
+# Full URLs with protocol; group 1 is everything after the scheme.
+_RE_HTTP_URL = re.compile(r'https?://([^\s]*)')
+
+# www. prefix; group 1 is the host and path after "www."
+_RE_WWW_URL = re.compile(r'\bwww\.([^\s]*)')
+
+# Domain-like patterns: requires at least 2 parts before TLD
+# This prevents "already" (.ly) or "finally" (.ly) from matching
+# Matches: github.io, example.com, zapagi.com
+# Doesn't match: already, finally, really
+_RE_MULTI_PART_DOMAIN = re.compile(
+    r'\b[a-z0-9][-a-z0-9]{1,}\.[a-z0-9][-a-z0-9]{0,}\.(com|org|net|io|ai|dev|co|me|info|app|edu|gov|tech|xyz|site|online)\b'
+)
+
+# Simple domain.tld but only if it looks like a domain (no spaces before/after dot)
+# Matches: zapagi.com, github.io
+# Doesn't match: "already" (has letters before .ly)
+_RE_SIMPLE_DOMAIN = re.compile(
+    r'\b[a-z0-9][-a-z0-9]{2,}\.(com|org|net|io|ai|dev|edu|gov)\b'
+)
+
+# Looser domain.tld pattern used only to pick the search target once a
+# message is being looked up; short names and extra TLDs such as x.co or
+# example.app are extracted even though detect_url() doesn't flag them
+_RE_DOMAIN_TARGET = re.compile(
+    r'\b([a-z0-9-]+\.(com|org|net|io|ai|dev|co|me|info|app|edu|gov|tech|xyz|site|online))\b',
+    re.IGNORECASE
+)
+
+# Exclude common words that end in valid TLDs
+_COMMON_FALSE_POSITIVES = frozenset({
+    'already', 'finally', 'really', 'early', 'fairly', 'nearly', 'clearly',
+    'actually', 'especially', 'family', 'barely', 'daily', 'easily'
+})
+
+
+# Keyword lists for classify_query(). Single words are matched as whole
+# tokens via set intersection, so inflected forms have to be listed too;
+# multi-word phrases fall back to substring checks.
+_TOKEN_RE = re.compile(r'\w+')
+
+# Explicit search phrases
+_SEARCH_WORDS = frozenset({"current", "currently"})
+_SEARCH_PHRASES = (
+    "search for", "look up", "find information about",
+    "what is the latest", "recent news",
+    "tell me about the website", "information about"
+)
+
+# Current events indicators
+_CURRENT_WORDS = frozenset({
+    "latest", "recent", "recently", "current", "currently", "today",
+    "2025", "2024", "now"
+})
+_CURRENT_PHRASES = ("this week", "this month")
+
+# Creative requests (avoid tools)
+_CREATIVE_WORDS = frozenset({
+    "imagine", "imagines", "imagined", "imagining",
+    "brainstorm", "brainstorms", "brainstormed", "brainstorming",
+})
+_CREATIVE_PHRASES = ("write a story", "create a poem", "make up", "creative writing")
+
+# Messages longer than this bypass the classify_query() cache
+_CLASSIFY_CACHE_MAX_LENGTH = 512
+
+# Calculation patterns
+_RE_CALCULATION = re.compile(r'\d+\s*[\+\-\*\/\^]\s*\d+|calculate|compute|solve')
+
+
+def detect_url(message_lower: str) -> Optional[re.Match]:
     """
-    Detect if message contains any URL or domain patterns.
+    Find the first URL or domain pattern in a message.
     Only triggers on actual domains, not common words ending in TLDs.
     
     Args:
-        message: User's query message
+        message_lower: User's query message, already lowercased
         
     Returns:
-        True if URL/domain detected, False otherwise
+        Match object for the detected URL/domain, or None if not found
     """
-    # Full URLs with protocol
-    if re.search(r'https?://', message, re.IGNORECASE):
-        return True
-    
-    # www. prefix
-    if re.search(r'\bwww\.', message, re.IGNORECASE):
-        return True
-    
-    # Domain-like patterns: requires at least 2 parts before TLD
-    # This prevents "already" (.ly) or "finally" (.ly) from matching
-    # Matches: github.io, example.com, zapagi.com
-    # Doesn't match: already, finally, really
-    domain_pattern = r'\b[a-z0-9][-a-z0-9]{1,}\.[a-z0-9][-a-z0-9]{0,}\.(com|org|net|io|ai|dev|co|me|info|app|edu|gov|tech|xyz|site|online)\b'
-    if re.search(domain_pattern, message, re.IGNORECASE):
-        return True
-    
-    # Simple domain.tld but only if it looks like a domain (no spaces before/after dot)
-    # Matches: zapagi.com, github.io
-    # Doesn't match: "already" (has letters before .ly)
-    simple_domain_pattern = r'\b[a-z0-9][-a-z0-9]{2,}\.(com|org|net|io|ai|dev|edu|gov)\b'
-    if re.search(simple_domain_pattern, message, re.IGNORECASE):
-        # Additional check: word before TLD should not be a common English word
-        match = re.search(simple_domain_pattern, message, re.IGNORECASE)
+    # Plain substring checks are much cheaper than starting the regex engine,
+    # and most messages contain no URL at all
+    if 'http://' in message_lower or 'https://' in message_lower:
+        match = _RE_HTTP_URL.search(message_lower)
         if match:
-            word_before_tld = match.group(0).split('.')[0].lower()
-            # Exclude common words that end in valid TLDs
-            common_false_positives = [
-                'already', 'finally', 'really', 'early', 'fairly', 'nearly', 'clearly',
-                'actually', 'especially', 'family', 'barely', 'daily', 'easily'
-            ]
-            if word_before_tld not in common_false_positives:
-                return True
+            return match
     
-    return False
+    if 'www.' in message_lower:
+        match = _RE_WWW_URL.search(message_lower)
+        if match:
+            return match
+    
+    # Every domain pattern needs a dot
+    if '.' not in message_lower:
+        return None
+    
+    match = _RE_MULTI_PART_DOMAIN.search(message_lower)
+    if match:
+        return match
+    
+    match = _RE_SIMPLE_DOMAIN.search(message_lower)
+    if match:
+        # Additional check: word before TLD should not be a common English word
+        word_before_tld = match.group(0).split('.')[0]
+        if word_before_tld not in _COMMON_FALSE_POSITIVES:
+            return match
+    
+    return None
 
 
-def extract_url_or_domain(message: str) -> str:
+def detect_url_patterns(message: str) -> bool:
     """
-    Extract primary URL or domain from message for search query.
+    Detect if message contains any URL or domain patterns.
     
     Args:
         message: User's query message
         
+    Returns:
+        True if URL/domain detected, False otherwise
+    """
+    return detect_url(message.lower()) is not None
+
+
+def extract_from_match(url_match: Optional[re.Match], message: str) -> str:
+    """
+    Slice the search target out of a match returned by detect_url().
+    
+    Args:
+        url_match: Match from detect_url(), or None
+        message: Original (non-lowercased) message the match was produced from
+        
     Returns:
         Extracted domain/URL or original message if no URL found
     """
-    # Try to extract full URL first
-    url_match = re.search(r'https?://([^\s]+)', message, re.IGNORECASE)
-    if url_match:
-        return url_match.group(1).rstrip('/')  # Remove trailing slash
-    
-    # Try www. prefix
-    www_match = re.search(r'www\.([^\s]+)', message, re.IGNORECASE)
-    if www_match:
-        return www_match.group(1).rstrip('/')
-    
-    # Try domain pattern
-    domain_match = re.search(
-        r'\b([a-z0-9-]+\.(com|org|net|io|ai|dev|co|me|info|app|edu|gov|tech|xyz|site|online))\b',
-        message,
-        re.IGNORECASE
-    )
+    if url_match is not None and url_match.re is not _RE_SIMPLE_DOMAIN:
+        # Slice the original to keep URL case; lower() can change the length of
+        # some non-ASCII text, in which case the spans only fit the lowercased copy
+        source = message if len(message) == len(url_match.string) else url_match.string
+        
+        if url_match.re is _RE_MULTI_PART_DOMAIN:
+            target = source[url_match.start():url_match.end()]
+        else:
+            target = source[url_match.start(1):url_match.end(1)].rstrip('/')  # Remove trailing slash
+        return target or message
+    
+    # Bare domains use the looser target pattern, so short names and TLDs
+    # that detection skips are still extracted
+    domain_match = _RE_DOMAIN_TARGET.search(message)
     if domain_match:
         return domain_match.group(1)
     
     return message
 
 
+def extract_url_or_domain(message: str) -> str:
+    """
+    Extract primary URL or domain from message for search query.
+    
+    Args:
+        message: User's query message
+        
+    Returns:
+        Extracted domain/URL or original message if no URL found
+    """
+    return extract_from_match(detect_url(message.lower()), message)
+
+
 def classify_query(message: str) -> Tuple[QueryType, ToolRequirement]:
     """
     Classify user query to determine tool requirements.
+    Short messages are cached, since greetings and starter prompts repeat often.
     
     Args:
         message: User's query message
@@ -113,46 +215,60 @@ def classify_query(message: str) -> Tuple[QueryType, ToolRequirement]:
     Returns:
         (QueryType, ToolRequirement) tuple
     """
+    return classify_query_with_target(message)[0]
+
+
+def classify_query_with_target(
+    message: str,
+) -> Tuple[Tuple[QueryType, ToolRequirement], Optional[str]]:
+    """
+    Classify user query and extract its URL/domain search target in one pass.
+    The target is sliced from the same match classification found, so callers
+    don't have to run extract_url_or_domain() over the message again.
+    
+    Args:
+        message: User's query message
+        
+    Returns:
+        ((QueryType, ToolRequirement), search_target) where search_target is
+        only set for URL_LOOKUP queries and None otherwise
+    """
+    # Long messages rarely repeat; keep them out of the cache
+    if len(message) > _CLASSIFY_CACHE_MAX_LENGTH:
+        return _classify_cached.__wrapped__(message)
+    return _classify_cached(message)
+
+
+@lru_cache(maxsize=256)
+def _classify_cached(message: str) -> Tuple[Tuple[QueryType, ToolRequirement], Optional[str]]:
+    """Classify a query; see classify_query_with_target()."""
     message_lower = message.lower()
     
     # URL/domain detection - HIGHEST PRIORITY
-    if detect_url_patterns(message):
-        return QueryType.URL_LOOKUP, ToolRequirement.REQUIRED
+    url_match = detect_url(message_lower)
+    if url_match is not None:
+        return _R_URL, extract_from_match(url_match, message)
+    
+    # Tokenize once; single-word keywords are checked against this set
+    tokens = frozenset(_TOKEN_RE.findall(message_lower))
     
     # Explicit search phrases
-    search_phrases = [
-        "search for", "look up", "find information about",
-        "what is the latest", "recent news", "current",
-        "tell me about the website", "information about"
-    ]
-    if any(phrase in message_lower for phrase in search_phrases):
-        return QueryType.WEB_SEARCH_REQUIRED, ToolRequirement.REQUIRED
+    if tokens & _SEARCH_WORDS or any(phrase in message_lower for phrase in _SEARCH_PHRASES):
+        return _R_SEARCH, None
     
     # Current events indicators
-    current_indicators = [
-        "latest", "recent", "current", "today", "this week",
-        "this month", "2025", "2024", "now", "currently"
-    ]
-    if any(indicator in message_lower for indicator in current_indicators):
-        return QueryType.CURRENT_EVENTS, ToolRequirement.RECOMMENDED
+    if tokens & _CURRENT_WORDS or any(phrase in message_lower for phrase in _CURRENT_PHRASES):
+        return _R_CURRENT, None
     
     # Calculation patterns
-    calc_patterns = [
-        r'\d+\s*[\+\-\*\/\^]\s*\d+',
-        r'calculate', r'compute', r'solve'
-    ]
-    if any(re.search(pattern, message_lower) for pattern in calc_patterns):
-        return QueryType.CALCULATION, ToolRequirement.REQUIRED
+    if _RE_CALCULATION.search(message_lower):
+        return _R_CALC, None
     
     # Creative requests (avoid tools)
-    creative_indicators = [
-        "write a story", "create a poem", "imagine",
-        "make up", "brainstorm", "creative writing"
-    ]
-    if any(indicator in message_lower for indicator in creative_indicators):
-        return QueryType.CREATIVE, ToolRequirement.NONE
-    
-    return QueryType.GENERAL_KNOWLEDGE, ToolRequirement.OPTIONAL
+    if tokens & _CREATIVE_WORDS or any(phrase in message_lower for phrase in _CREATIVE_PHRASES):
+        return _R_CREATIVE, None
+    
+    return _R_GENERAL, None
 
 
 # Tool enforcement removed - tools are passed via bind_tools(), not prompt text
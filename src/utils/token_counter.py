@@ -1,17 +1,84 @@
 """
 Token counting utilities for tracking LLM usage
 """
+import logging
+import os
+import time
+from types import MappingProxyType
+from typing import Dict, List, NamedTuple, Optional
 
+try:
+    import tiktoken
+except ImportError:  # pragma: no cover - tiktoken is optional at runtime
+    tiktoken = None
 
-def estimate_tokens(text: str) -> int:
+logger = logging.getLogger(__name__)
+
+
+# Encodings loaded so far, keyed by model name. Failed loads are not stored, so
+# a transient download error doesn't disable BPE counting for the process
+_ENCODINGS: Dict[str, "tiktoken.Encoding"] = {}
+_LOAD_RETRY_SECONDS = 60.0
+_last_load_failure: Dict[str, float] = {}
+
+
+def _load_encoding(model_name: str) -> "Optional[tiktoken.Encoding]":
+    """
+    Load the tiktoken encoding for a model.
+    GPT models use their own encoding; everything else uses cl100k_base.
+    Returns None when tiktoken or its encoding files are unavailable.
+    """
+    if tiktoken is None:
+        return None
+    
+    try:
+        if model_name.startswith("gpt"):
+            return tiktoken.encoding_for_model(model_name)
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        logger.warning(f"tiktoken encoding unavailable for '{model_name}', using estimate: {e}")
+        return None
+
+
+def _get_encoding(model_name: str) -> "Optional[tiktoken.Encoding]":
+    """
+    Return the cached encoding for a model, loading it on a miss.
+    After a failed load the character estimate is used until the retry
+    interval has passed, so request handlers don't re-attempt the download
+    on every call.
+    """
+    encoding = _ENCODINGS.get(model_name)
+    if encoding is not None:
+        return encoding
+    
+    failed_at = _last_load_failure.get(model_name)
+    if failed_at is not None and time.monotonic() - failed_at < _LOAD_RETRY_SECONDS:
+        return None
+    
+    encoding = _load_encoding(model_name)
+    if encoding is None:
+        _last_load_failure[model_name] = time.monotonic()
+        return None
+    
+    _last_load_failure.pop(model_name, None)
+    _ENCODINGS[model_name] = encoding
+    return encoding
+
+
+def preload_encoding(model_name: str = "default") -> bool:
+    """
+    Load the encoding ahead of time, e.g. at app startup.
+    tiktoken downloads encoding files on a cold cache; doing that here keeps
+    the fetch out of the async request handlers. Returns whether it loaded.
+    """
+    return _get_encoding(model_name) is not None
+
+
+def _estimate_tokens_by_chars(text: str) -> int:
     """
     Estimate token count using a simple heuristic.
     This is a rough approximation: ~4 characters per token for English text.
-    For production, consider using tiktoken for accurate counting.
     """
-    if not text:
-        return 0
-    
     # Average of 4 characters per token (conservative estimate)
     char_count = len(text)
     estimated_tokens = char_count // 4
@@ -22,22 +89,79 @@ def estimate_tokens(text: str) -> int:
     return estimated_tokens + buffer
 
 
+def estimate_tokens(text: str, model_name: str = "default") -> int:
+    """
+    Count tokens using tiktoken's BPE encoder.
+    Falls back to a ~4 characters per token estimate when tiktoken is unavailable.
+    """
+    if not text:
+        return 0
+    
+    encoding = _get_encoding(model_name)
+    if encoding is None:
+        return _estimate_tokens_by_chars(text)
+    
+    # Treat special-token text in user content as plain text; encode_ordinary
+    # skips the special-token scan that encode() does even when none are allowed
+    return len(encoding.encode_ordinary(text))
+
+
+# encode_ordinary_batch() starts a new thread pool on every call, which costs
+# more than it saves for short conversations; smaller batches encode serially
+_BATCH_PARALLEL_MIN_TEXTS = 32
+_BATCH_MAX_THREADS = min(4, os.cpu_count() or 1)
+
+
+def estimate_tokens_batch(texts: List[str], model_name: str = "default") -> List[int]:
+    """
+    Count tokens for many texts at once.
+    Long histories are encoded on a small native thread pool; short ones are
+    encoded serially, since starting the pool would cost more than it saves.
+    """
+    encoding = _get_encoding(model_name)
+    if encoding is None:
+        return [_estimate_tokens_by_chars(text) if text else 0 for text in texts]
+    
+    if len(texts) < _BATCH_PARALLEL_MIN_TEXTS:
+        return [len(encoding.encode_ordinary(text)) for text in texts]
+    
+    encoded = encoding.encode_ordinary_batch(texts, num_threads=_BATCH_MAX_THREADS)
+    return [len(ids) for ids in encoded]
+
+
+# Context window sizes keyed by lowercase model name
+_MODEL_LIMITS = MappingProxyType({
+    "gpt-4": 8192,
+    "gpt-4-32k": 32768,
+    "gpt-3.5-turbo": 4096,
+    "gpt-3.5-turbo-16k": 16384,
+    "llama2": 4096,
+    "llama3": 8192,
+    "mistral": 8192,
+    "default": 8192,  # Safe default
+})
+
+
 def get_context_window_limit(model_name: str = "default") -> int:
     """
     Get the context window limit for a given model.
     """
-    model_limits = {
-        "gpt-4": 8192,
-        "gpt-4-32k": 32768,
-        "gpt-3.5-turbo": 4096,
-        "gpt-3.5-turbo-16k": 16384,
-        "llama2": 4096,
-        "llama3": 8192,
-        "mistral": 8192,
-        "default": 8192,  # Safe default
-    }
-    
-    return model_limits.get(model_name.lower(), model_limits["default"])
+    # Names from code are already lowercase; only lowercase on a miss
+    return _MODEL_LIMITS.get(model_name) or _MODEL_LIMITS.get(
+        model_name.lower(), _MODEL_LIMITS["default"]
+    )
+
+
+class ContextUsage(NamedTuple):
+    """Context window usage statistics for a conversation."""
+    total_tokens: int
+    max_tokens: int
+    usage_percentage: float
+    remaining_tokens: int
+    messages_tokens: int
+    system_prompt_tokens: int
+    document_context_tokens: int
+    is_near_limit: bool
 
 
 def calculate_context_usage(
@@ -45,26 +169,24 @@ def calculate_context_usage(
     system_prompt_tokens: int = 0,
     document_context_tokens: int = 0,
     model_name: str = "default"
-) -> dict:
+) -> ContextUsage:
     """
     Calculate context window usage statistics.
     
     Returns:
-        dict with usage stats including percentage, remaining tokens, etc.
+        ContextUsage with usage stats including percentage, remaining tokens, etc.
+        Use ._asdict() where a plain dict is needed.
     """
     total_tokens = messages_tokens + system_prompt_tokens + document_context_tokens
     max_tokens = get_context_window_limit(model_name)
     
-    usage_percentage = (total_tokens / max_tokens) * 100
-    remaining_tokens = max_tokens - total_tokens
-    
-    return {
-        "total_tokens": total_tokens,
-        "max_tokens": max_tokens,
-        "usage_percentage": round(usage_percentage, 2),
-        "remaining_tokens": remaining_tokens,
-        "messages_tokens": messages_tokens,
-        "system_prompt_tokens": system_prompt_tokens,
-        "document_context_tokens": document_context_tokens,
-        "is_near_limit": usage_percentage > 80,
-    }
+    return ContextUsage(
+        total_tokens=total_tokens,
+        max_tokens=max_tokens,
+        usage_percentage=round(total_tokens * 100 / max_tokens, 2),
+        remaining_tokens=max_tokens - total_tokens,
+        messages_tokens=messages_tokens,
+        system_prompt_tokens=system_prompt_tokens,
+        document_context_tokens=document_context_tokens,
+        is_near_limit=total_tokens * 100 > 80 * max_tokens,
+    )
@@ -1,15 +1,46 @@
 """
 Comprehensive API Test Suite for AI Study Buddy
 Tests all endpoints with all AI models
+
+Uses aiohttp with one shared session so independent model conversations
+run concurrently instead of one after another. Requests use HTTP/1.1
+keep-alive connections from a pool: the backend runs under uvicorn, which
+does not serve HTTP/2, so an HTTP/2 client would gain no multiplexing here.
 """
-import requests
-import json
+import aiohttp
+import asyncio
+import orjson
+import sys
 import time
-from typing import Dict, List, Optional
-from datetime import datetime
-import os
+import weakref
+from functools import lru_cache
+from itertools import pairwise
+from typing import List, Optional, Set, Tuple
 
 BASE_URL = "http://localhost:8001/api/v1"
+MAX_CONCURRENT_MODELS = 4
+
+# Bound once so log() skips the module attribute lookup per line
+_localtime = time.localtime
+
+# Endpoint URLs, built once; parameterized URLs append an ID to these
+SIGNUP_URL = f"{BASE_URL}/auth/signup"
+LOGIN_URL = f"{BASE_URL}/auth/login"
+ME_URL = f"{BASE_URL}/users/me"
+PROJECTS_URL = f"{BASE_URL}/projects"
+CHAT_URL = f"{BASE_URL}/chat"
+CONVERSATIONS_URL = f"{BASE_URL}/conversations"
+CHAT_CONVERSATIONS_URL = f"{BASE_URL}/chat/conversations"
+CHAT_PROJECTS_URL = f"{BASE_URL}/chat/projects"
+STATS_URL = f"{BASE_URL}/stats/overview"
+MODELS_URL = f"{BASE_URL}/system/models"
+
+
+@lru_cache(maxsize=None)
+def _project_url(project_id: int) -> str:
+    """URL for a single project"""
+    return f"{PROJECTS_URL}/{project_id}"
+
 
 class Colors:
     HEADER = '\033[95m'
@@ -22,137 +53,138 @@ class Colors:
     BOLD = '\033[1m'
 
 class APITester:
-    def __init__(self):
+    # (color, symbol) for a passed/failed result
+    _RESULT_STYLES = {True: (Colors.OKGREEN, "✓"), False: (Colors.FAIL, "✗")}
+    
+    # Color + symbol prefix per log status; unknown statuses log as INFO
+    _LOG_PREFIXES = {
+        "PASS": "".join(_RESULT_STYLES[True]),
+        "FAIL": "".join(_RESULT_STYLES[False]),
+        "TEST": f"{Colors.OKCYAN}➤",
+        "INFO": f"{Colors.OKBLUE}ℹ",
+    }
+    
+    def __init__(self, session: aiohttp.ClientSession):
+        self.session = session
         self.token: Optional[str] = None
         self.user_id: Optional[int] = None
-        self.test_results: List[Dict] = []
+        # (test name, passed, details, time.time() when recorded)
+        self.test_results: List[Tuple[str, bool, str, float]] = []
         self.projects: List[int] = []
         self.conversations: List[int] = []
+        # Max model conversations in flight at once
+        self.model_slots = asyncio.Semaphore(MAX_CONCURRENT_MODELS)
         
     def log(self, message: str, status: str = "INFO"):
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        if status == "PASS":
-            print(f"{Colors.OKGREEN}✓ [{timestamp}] {message}{Colors.ENDC}")
-        elif status == "FAIL":
-            print(f"{Colors.FAIL}✗ [{timestamp}] {message}{Colors.ENDC}")
-        elif status == "TEST":
-            print(f"{Colors.OKCYAN}➤ [{timestamp}] {message}{Colors.ENDC}")
-        else:
-            print(f"{Colors.OKBLUE}ℹ [{timestamp}] {message}{Colors.ENDC}")
+        prefix = self._LOG_PREFIXES.get(status, self._LOG_PREFIXES["INFO"])
+        t = _localtime()
+        sys.stdout.write(f"{prefix} [{t.tm_hour:02d}:{t.tm_min:02d}:{t.tm_sec:02d}] {message}{Colors.ENDC}\n")
     
     def record_test(self, test_name: str, passed: bool, details: str = ""):
-        self.test_results.append({
-            "test": test_name,
-            "passed": passed,
-            "details": details,
-            "timestamp": datetime.now().isoformat()
-        })
+        self.test_results.append((test_name, passed, details, time.time()))
     
     # ==================== AUTH TESTS ====================
     
-    def test_signup(self, email: str, name: str, password: str) -> bool:
+    async def test_signup(self, email: str, name: str, password: str) -> bool:
         """Test user signup"""
         self.log(f"Testing signup for {email}", "TEST")
         try:
-            response = requests.post(
-                f"{BASE_URL}/auth/signup",
+            async with self.session.post(
+                SIGNUP_URL,
                 json={"email": email, "name": name, "password": password}
-            )
-            
-            if response.status_code not in [200, 201]:
-                self.log(f"Signup failed with status {response.status_code}: {response.text}", "FAIL")
-                self.record_test("User Signup", False, f"Status {response.status_code}")
-                return False
-            
-            data = response.json()
-            
-            if "access_token" not in data:
-                self.log(f"Signup response missing access_token: {response.text}", "FAIL")
-                self.record_test("User Signup", False, "Missing access_token")
-                return False
-            
-            self.token = data["access_token"]
-            self.user_id = data["user"]["id"]
-            self.log(f"Signup successful - User ID: {self.user_id}", "PASS")
-            self.record_test("User Signup", True, f"User {email} created")
-            return True
+            ) as response:
+                
+                if response.status not in [200, 201]:
+                    self.log(f"Signup failed with status {response.status}: {await response.text()}", "FAIL")
+                    self.record_test("User Signup", False, f"Status {response.status}")
+                    return False
+                
+                data = await response.json(loads=orjson.loads)
+                
+                if "access_token" not in data:
+                    self.log(f"Signup response missing access_token: {await response.text()}", "FAIL")
+                    self.record_test("User Signup", False, "Missing access_token")
+                    return False
+                
+                self.set_token(data["access_token"])
+                self.user_id = data["user"]["id"]
+                self.log(f"Signup successful - User ID: {self.user_id}", "PASS")
+                self.record_test("User Signup", True, f"User {email} created")
+                return True
         except Exception as e:
             self.log(f"Signup error: {str(e)}", "FAIL")
             self.record_test("User Signup", False, str(e))
             return False
     
-    def test_login(self, email: str, password: str) -> bool:
+    async def test_login(self, email: str, password: str) -> bool:
         """Test user login"""
         self.log(f"Testing login for {email}", "TEST")
         try:
-            response = requests.post(
-                f"{BASE_URL}/auth/login",
+            async with self.session.post(
+                LOGIN_URL,
                 json={"email": email, "password": password}
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                self.token = data["access_token"]
-                self.user_id = data["user"]["id"]
-                self.log("Login successful", "PASS")
-                self.record_test("User Login", True, f"Logged in as {email}")
-                return True
-            else:
-                self.log(f"Login failed: {response.text}", "FAIL")
-                self.record_test("User Login", False, response.text)
-                return False
+            ) as response:
+                
+                if response.status == 200:
+                    data = await response.json(loads=orjson.loads)
+                    self.set_token(data["access_token"])
+                    self.user_id = data["user"]["id"]
+                    self.log("Login successful", "PASS")
+                    self.record_test("User Login", True, f"Logged in as {email}")
+                    return True
+                else:
+                    self.log(f"Login failed: {await response.text()}", "FAIL")
+                    self.record_test("User Login", False, await response.text())
+                    return False
         except Exception as e:
             self.log(f"Login error: {str(e)}", "FAIL")
             self.record_test("User Login", False, str(e))
             return False
     
-    def get_headers(self) -> Dict:
-        """Get authorization headers"""
-        return {"Authorization": f"Bearer {self.token}"}
+    def set_token(self, token: str):
+        """Store the access token and send it on every request from the shared session"""
+        self.token = token
+        self.session.headers["Authorization"] = f"Bearer {token}"
     
     # ==================== USER PROFILE TESTS ====================
     
-    def test_get_profile(self) -> bool:
+    async def test_get_profile(self) -> bool:
         """Test getting user profile"""
         self.log("Testing get profile", "TEST")
         try:
-            response = requests.get(
-                f"{BASE_URL}/users/me",
-                headers=self.get_headers()
-            )
-            
-            if response.status_code == 200:
-                user = response.json()
-                self.log(f"Profile retrieved - Name: {user['name']}", "PASS")
-                self.record_test("Get User Profile", True, f"Retrieved profile for {user['email']}")
-                return True
-            else:
-                self.log(f"Get profile failed: {response.text}", "FAIL")
-                self.record_test("Get User Profile", False, response.text)
-                return False
+            async with self.session.get(ME_URL) as response:
+                
+                if response.status == 200:
+                    user = await response.json(loads=orjson.loads)
+                    self.log(f"Profile retrieved - Name: {user['name']}", "PASS")
+                    self.record_test("Get User Profile", True, f"Retrieved profile for {user['email']}")
+                    return True
+                else:
+                    self.log(f"Get profile failed: {await response.text()}", "FAIL")
+                    self.record_test("Get User Profile", False, await response.text())
+                    return False
         except Exception as e:
             self.log(f"Get profile error: {str(e)}", "FAIL")
             self.record_test("Get User Profile", False, str(e))
             return False
     
-    def test_update_profile(self, bio: str = "Test Bio") -> bool:
+    async def test_update_profile(self, bio: str = "Test Bio") -> bool:
         """Test updating user profile"""
         self.log("Testing update profile", "TEST")
         try:
-            response = requests.put(
-                f"{BASE_URL}/users/me",
-                headers=self.get_headers(),
+            async with self.session.put(
+                ME_URL,
                 json={"bio": bio, "organization": "Test Organization"}
-            )
-            
-            if response.status_code == 200:
-                self.log("Profile updated successfully", "PASS")
-                self.record_test("Update User Profile", True, "Updated bio and organization")
-                return True
-            else:
-                self.log(f"Update profile failed: {response.text}", "FAIL")
-                self.record_test("Update User Profile", False, response.text)
-                return False
+            ) as response:
+                
+                if response.status == 200:
+                    self.log("Profile updated successfully", "PASS")
+                    self.record_test("Update User Profile", True, "Updated bio and organization")
+                    return True
+                else:
+                    self.log(f"Update profile failed: {await response.text()}", "FAIL")
+                    self.record_test("Update User Profile", False, await response.text())
+                    return False
         except Exception as e:
             self.log(f"Update profile error: {str(e)}", "FAIL")
             self.record_test("Update User Profile", False, str(e))
@@ -160,13 +192,12 @@ class APITester:
     
     # ==================== PROJECT TESTS ====================
     
-    def test_create_project(self, name: str, description: str, agent_name: str = "Test Agent") -> Optional[int]:
+    async def test_create_project(self, name: str, description: str, agent_name: str = "Test Agent") -> Optional[int]:
         """Test creating a project"""
         self.log(f"Testing create project: {name}", "TEST")
         try:
-            response = requests.post(
-                f"{BASE_URL}/projects",
-                headers=self.get_headers(),
+            async with self.session.post(
+                PROJECTS_URL,
                 json={
                     "name": name,
                     "description": description,
@@ -175,64 +206,58 @@ class APITester:
                     "system_prompt": "You are a helpful AI assistant.",
                     "tools": ["web_search"]
                 }
-            )
-            
-            if response.status_code in [200, 201]:
-                project = response.json()
-                project_id = project["id"]
-                self.projects.append(project_id)
-                self.log(f"Project created - ID: {project_id}", "PASS")
-                self.record_test("Create Project", True, f"Created project: {name}")
-                return project_id
-            else:
-                self.log(f"Create project failed: {response.text}", "FAIL")
-                self.record_test("Create Project", False, response.text)
-                return None
+            ) as response:
+                
+                if response.status in [200, 201]:
+                    project = await response.json(loads=orjson.loads)
+                    project_id = project["id"]
+                    self.projects.append(project_id)
+                    self.log(f"Project created - ID: {project_id}", "PASS")
+                    self.record_test("Create Project", True, f"Created project: {name}")
+                    return project_id
+                else:
+                    self.log(f"Create project failed: {await response.text()}", "FAIL")
+                    self.record_test("Create Project", False, await response.text())
+                    return None
         except Exception as e:
             self.log(f"Create project error: {str(e)}", "FAIL")
             self.record_test("Create Project", False, str(e))
             return None
     
-    def test_get_projects(self) -> bool:
+    async def test_get_projects(self) -> bool:
         """Test getting all projects"""
         self.log("Testing get projects", "TEST")
         try:
-            response = requests.get(
-                f"{BASE_URL}/projects",
-                headers=self.get_headers()
-            )
-            
-            if response.status_code == 200:
-                projects = response.json()
-                self.log(f"Retrieved {len(projects)} projects", "PASS")
-                self.record_test("Get Projects", True, f"Retrieved {len(projects)} projects")
-                return True
-            else:
-                self.log(f"Get projects failed: {response.text}", "FAIL")
-                self.record_test("Get Projects", False, response.text)
-                return False
+            async with self.session.get(PROJECTS_URL) as response:
+                
+                if response.status == 200:
+                    projects = await response.json(loads=orjson.loads)
+                    self.log(f"Retrieved {len(projects)} projects", "PASS")
+                    self.record_test("Get Projects", True, f"Retrieved {len(projects)} projects")
+                    return True
+                else:
+                    self.log(f"Get projects failed: {await response.text()}", "FAIL")
+                    self.record_test("Get Projects", False, await response.text())
+                    return False
         except Exception as e:
             self.log(f"Get projects error: {str(e)}", "FAIL")
             self.record_test("Get Projects", False, str(e))
             return False
     
-    def test_delete_project(self, project_id: int) -> bool:
+    async def test_delete_project(self, project_id: int) -> bool:
         """Test deleting a project"""
         self.log(f"Testing delete project: {project_id}", "TEST")
         try:
-            response = requests.delete(
-                f"{BASE_URL}/projects/{project_id}",
-                headers=self.get_headers()
-            )
-            
-            if response.status_code in [200, 204]:
-                self.log(f"Project {project_id} deleted", "PASS")
-                self.record_test("Delete Project", True, f"Deleted project {project_id}")
-                return True
-            else:
-                self.log(f"Delete project failed: {response.text}", "FAIL")
-                self.record_test("Delete Project", False, response.text)
-                return False
+            async with self.session.delete(_project_url(project_id)) as response:
+                
+                if response.status in [200, 204]:
+                    self.log(f"Project {project_id} deleted", "PASS")
+                    self.record_test("Delete Project", True, f"Deleted project {project_id}")
+                    return True
+                else:
+                    self.log(f"Delete project failed: {await response.text()}", "FAIL")
+                    self.record_test("Delete Project", False, await response.text())
+                    return False
         except Exception as e:
             self.log(f"Delete project error: {str(e)}", "FAIL")
             self.record_test("Delete Project", False, str(e))
@@ -240,169 +265,204 @@ class APITester:
     
     # ==================== CONVERSATION & MESSAGE TESTS ====================
     
-    def test_create_conversation(self, project_id: int, model: str, test_message: str, use_gpu: bool = True) -> Optional[int]:
+    async def test_create_conversation(self, project_id: int, model: str, test_message: str, use_gpu: bool = True, stream: bool = True) -> Optional[int]:
         """Test creating a conversation and sending a message with specific model"""
         gpu_status = "GPU" if use_gpu else "CPU"
-        self.log(f"Testing conversation with model: {model} ({gpu_status})", "TEST")
+        mode = "SSE" if stream else "JSON"
+        test_name = f"Create Conversation ({model}, {mode})"
+        self.log(f"Testing conversation with model: {model} ({gpu_status}, {mode})", "TEST")
         try:
-            response = requests.post(
-                f"{BASE_URL}/chat",
-                headers=self.get_headers(),
+            async with self.session.post(
+                CHAT_URL,
                 json={
                     "project_id": project_id,
                     "message": test_message,
                     "model": model,
                     "use_gpu": use_gpu,
-                    "conversation_id": None
+                    "conversation_id": None,
+                    "stream": stream
                 }
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                conversation_id = data.get("conversation_id")
-                response_obj = data.get("response", {})
-                assistant_message = response_obj.get("content", "") if isinstance(response_obj, dict) else str(response_obj)
+            ) as response:
                 
-                self.conversations.append(conversation_id)
-                self.log(f"Conversation created - Model: {model}, Conv ID: {conversation_id}", "PASS")
-                if assistant_message:
-                    preview = assistant_message[:100] if len(assistant_message) > 100 else assistant_message
-                    self.log(f"Response preview: {preview}...", "INFO")
-                self.record_test(f"Create Conversation ({model})", True, f"Conv ID: {conversation_id}")
-                return conversation_id
-            else:
-                self.log(f"Create conversation failed ({model}): {response.text}", "FAIL")
-                self.record_test(f"Create Conversation ({model})", False, response.text)
-                return None
+                if response.status == 200:
+                    if stream:
+                        # Read the SSE stream event by event, keeping only enough of the
+                        # reply for the preview instead of buffering the whole response
+                        conversation_id = None
+                        assistant_message = ""
+                        async for line in response.content:
+                            if not line.startswith(b"data: "):
+                                continue
+                            event = orjson.loads(line[6:])
+                            if "chunk" in event:
+                                if len(assistant_message) < 100:
+                                    assistant_message += event["chunk"]
+                            elif event.get("done"):
+                                conversation_id = event.get("conversation_id")
+                    else:
+                        data = await response.json(loads=orjson.loads)
+                        conversation_id = data.get("conversation_id")
+                        response_obj = data.get("response", {})
+                        assistant_message = response_obj.get("content", "") if isinstance(response_obj, dict) else str(response_obj)
+                    
+                    if conversation_id is None:
+                        self.log(f"Create conversation failed ({model}, {mode}): no conversation ID returned", "FAIL")
+                        self.record_test(test_name, False, "No conversation ID returned")
+                        return None
+                    
+                    self.conversations.append(conversation_id)
+                    self.log(f"Conversation created - Model: {model}, Conv ID: {conversation_id}", "PASS")
+                    if assistant_message:
+                        preview = assistant_message[:100]
+                        self.log(f"Response preview: {preview}...", "INFO")
+                    self.record_test(test_name, True, f"Conv ID: {conversation_id}")
+                    return conversation_id
+                else:
+                    self.log(f"Create conversation failed ({model}, {mode}): {await response.text()}", "FAIL")
+                    self.record_test(test_name, False, await response.text())
+                    return None
         except Exception as e:
-            self.log(f"Create conversation error ({model}): {str(e)}", "FAIL")
-            self.record_test(f"Create Conversation ({model})", False, str(e))
+            self.log(f"Create conversation error ({model}, {mode}): {str(e)}", "FAIL")
+            self.record_test(test_name, False, str(e))
             return None
     
-    def test_get_conversation_messages(self, conversation_id: int) -> bool:
+    async def test_model_conversation(self, project_id: int, model: str, use_gpu: bool, stream: bool = True) -> Optional[int]:
+        """Create a conversation with a model, then verify its messages were stored"""
+        async with self.model_slots:
+            self.log(f"\nTesting {'GPU' if use_gpu else 'CPU'} model: {model}...", "INFO")
+            conv_id = await self.test_create_conversation(
+                project_id,
+                model,
+                f"Hello! Please respond with a simple greeting. This is a test of the {model} model.",
+                use_gpu=use_gpu,
+                stream=stream
+            )
+            if conv_id:
+                await self.test_get_conversation_messages(conv_id)
+            return conv_id
+    
+    async def test_get_conversation_messages(self, conversation_id: int) -> bool:
         """Test retrieving conversation messages"""
         self.log(f"Testing get messages for conversation {conversation_id}", "TEST")
         try:
-            response = requests.get(
-                f"{BASE_URL}/conversations/{conversation_id}/messages",
-                headers=self.get_headers()
-            )
-            
-            if response.status_code == 200:
-                messages = response.json()
-                self.log(f"Retrieved {len(messages)} messages", "PASS")
-                self.record_test("Get Conversation Messages", True, f"{len(messages)} messages retrieved")
-                return True
-            else:
-                self.log(f"Get messages failed: {response.text}", "FAIL")
-                self.record_test("Get Conversation Messages", False, response.text)
-                return False
+            async with self.session.get(f"{CONVERSATIONS_URL}/{conversation_id}/messages") as response:
+                
+                if response.status == 200:
+                    messages = await response.json(loads=orjson.loads)
+                    self.log(f"Retrieved {len(messages)} messages", "PASS")
+                    self.record_test("Get Conversation Messages", True, f"{len(messages)} messages retrieved")
+                    return True
+                else:
+                    self.log(f"Get messages failed: {await response.text()}", "FAIL")
+                    self.record_test("Get Conversation Messages", False, await response.text())
+                    return False
         except Exception as e:
             self.log(f"Get messages error: {str(e)}", "FAIL")
             self.record_test("Get Conversation Messages", False, str(e))
             return False
     
-    def test_update_conversation_title(self, conversation_id: int, new_title: str) -> bool:
+    async def test_update_conversation_title(self, conversation_id: int, new_title: str) -> bool:
         """Test updating conversation title (PATCH endpoint)"""
         self.log(f"Testing update conversation title to: {new_title}", "TEST")
         try:
-            response = requests.patch(
-                f"{BASE_URL}/chat/conversations/{conversation_id}",
-                headers=self.get_headers(),
+            async with self.session.patch(
+                f"{CHAT_CONVERSATIONS_URL}/{conversation_id}",
                 json={"title": new_title}
-            )
-            
-            if response.status_code == 200:
-                data = response.json()
-                self.log(f"Title updated successfully to: {data.get('title')}", "PASS")
-                self.record_test("Update Conversation Title", True, f"Updated to: {new_title}")
-                return True
-            else:
-                self.log(f"Update title failed: {response.text}", "FAIL")
-                self.record_test("Update Conversation Title", False, response.text)
-                return False
+            ) as response:
+                
+                if response.status == 200:
+                    data = await response.json(loads=orjson.loads)
+                    self.log(f"Title updated successfully to: {data.get('title')}", "PASS")
+                    self.record_test("Update Conversation Title", True, f"Updated to: {new_title}")
+                    return True
+                else:
+                    self.log(f"Update title failed: {await response.text()}", "FAIL")
+                    self.record_test("Update Conversation Title", False, await response.text())
+                    return False
         except Exception as e:
             self.log(f"Update title error: {str(e)}", "FAIL")
             self.record_test("Update Conversation Title", False, str(e))
             return False
     
-    def test_delete_conversation(self, conversation_id: int) -> bool:
+    async def test_delete_conversation(self, conversation_id: int) -> bool:
         """Test deleting a conversation (DELETE endpoint)"""
         self.log(f"Testing delete conversation: {conversation_id}", "TEST")
         try:
-            response = requests.delete(
-                f"{BASE_URL}/chat/conversations/{conversation_id}",
-                headers=self.get_headers()
-            )
-            
-            if response.status_code == 200:
-                self.log(f"Conversation {conversation_id} deleted successfully", "PASS")
-                self.record_test("Delete Conversation", True, f"Deleted conversation {conversation_id}")
-                return True
-            else:
-                self.log(f"Delete conversation failed: {response.text}", "FAIL")
-                self.record_test("Delete Conversation", False, response.text)
-                return False
+            async with self.session.delete(f"{CHAT_CONVERSATIONS_URL}/{conversation_id}") as response:
+                
+                if response.status == 200:
+                    self.log(f"Conversation {conversation_id} deleted successfully", "PASS")
+                    self.record_test("Delete Conversation", True, f"Deleted conversation {conversation_id}")
+                    return True
+                else:
+                    self.log(f"Delete conversation failed: {await response.text()}", "FAIL")
+                    self.record_test("Delete Conversation", False, await response.text())
+                    return False
         except Exception as e:
             self.log(f"Delete conversation error: {str(e)}", "FAIL")
             self.record_test("Delete Conversation", False, str(e))
             return False
     
-    def test_get_project_conversations(self, project_id: int) -> bool:
+    async def test_get_project_conversations(self, project_id: int) -> bool:
         """Test getting all conversations for a project (verify sorting)"""
         self.log(f"Testing get conversations for project {project_id}", "TEST")
         try:
-            response = requests.get(
-                f"{BASE_URL}/chat/projects/{project_id}/conversations",
-                headers=self.get_headers()
-            )
-            
-            if response.status_code == 200:
-                conversations = response.json()
-                self.log(f"Retrieved {len(conversations)} conversations", "PASS")
-                
-                # Verify conversations are sorted by updated_at (newest first)
-                if len(conversations) > 1:
-                    for i in range(len(conversations) - 1):
-                        current_time = conversations[i].get('updated_at')
-                        next_time = conversations[i + 1].get('updated_at')
-                        if current_time and next_time and current_time < next_time:
-                            self.log("Warning: Conversations not properly sorted", "WARNING")
+            async with self.session.get(f"{CHAT_PROJECTS_URL}/{project_id}/conversations") as response:
                 
-                self.record_test("Get Project Conversations", True, f"{len(conversations)} conversations")
-                return True
-            else:
-                self.log(f"Get conversations failed: {response.text}", "FAIL")
-                self.record_test("Get Project Conversations", False, response.text)
-                return False
+                if response.status == 200:
+                    conversations = await response.json(loads=orjson.loads)
+                    self.log(f"Retrieved {len(conversations)} conversations", "PASS")
+                    
+                    # Verify conversations are sorted by updated_at (newest first)
+                    times = [c.get('updated_at') for c in conversations]
+                    if any(a and b and a < b for a, b in pairwise(times)):
+                        self.log("Warning: Conversations not properly sorted", "WARNING")
+                    
+                    self.record_test("Get Project Conversations", True, f"{len(conversations)} conversations")
+                    return True
+                else:
+                    self.log(f"Get conversations failed: {await response.text()}", "FAIL")
+                    self.record_test("Get Project Conversations", False, await response.text())
+                    return False
         except Exception as e:
             self.log(f"Get conversations error: {str(e)}", "FAIL")
             self.record_test("Get Project Conversations", False, str(e))
             return False
     
+    async def get_available_models(self) -> Optional[Set[str]]:
+        """Get names of models pulled into Ollama, or None if the list is unavailable"""
+        try:
+            async with self.session.get(MODELS_URL) as response:
+                if response.status != 200:
+                    return None
+                data = await response.json(loads=orjson.loads)
+                if not data.get("success"):
+                    return None
+                return {model["name"] for model in data.get("models", [])}
+        except Exception as e:
+            self.log(f"Could not list models: {str(e)}", "INFO")
+            return None
+    
     # ==================== STATS TESTS ====================
     
-    def test_get_stats(self) -> bool:
+    async def test_get_stats(self) -> bool:
         """Test getting stats overview"""
         self.log("Testing get stats overview", "TEST")
         try:
-            response = requests.get(
-                f"{BASE_URL}/stats/overview",
-                headers=self.get_headers()
-            )
-            
-            if response.status_code == 200:
-                stats = response.json()
-                # Handle different possible response structures
-                projects = stats.get('total_projects', stats.get('projects', 0))
-                conversations = stats.get('total_conversations', stats.get('conversations', 0))
-                self.log(f"Stats: {projects} projects, {conversations} conversations", "PASS")
-                self.record_test("Get Stats Overview", True, json.dumps(stats))
-                return True
-            else:
-                self.log(f"Get stats failed: {response.text}", "FAIL")
-                self.record_test("Get Stats Overview", False, response.text)
-                return False
+            async with self.session.get(STATS_URL) as response:
+                
+                if response.status == 200:
+                    stats = await response.json(loads=orjson.loads)
+                    # Handle different possible response structures
+                    projects = stats.get('total_projects', stats.get('projects', 0))
+                    conversations = stats.get('total_conversations', stats.get('conversations', 0))
+                    self.log(f"Stats: {projects} projects, {conversations} conversations", "PASS")
+                    self.record_test("Get Stats Overview", True, orjson.dumps(stats).decode())
+                    return True
+                else:
+                    self.log(f"Get stats failed: {await response.text()}", "FAIL")
+                    self.record_test("Get Stats Overview", False, await response.text())
+                    return False
         except Exception as e:
             self.log(f"Get stats error: {str(e)}", "FAIL")
             self.record_test("Get Stats Overview", False, str(e))
@@ -410,23 +470,20 @@ class APITester:
     
     # ==================== CLEANUP ====================
     
-    def test_delete_account(self) -> bool:
+    async def test_delete_account(self) -> bool:
         """Test deleting user account"""
         self.log("Testing delete account", "TEST")
         try:
-            response = requests.delete(
-                f"{BASE_URL}/users/me",
-                headers=self.get_headers()
-            )
-            
-            if response.status_code == 200:
-                self.log("Account deleted successfully", "PASS")
-                self.record_test("Delete User Account", True, "Account and all data deleted")
-                return True
-            else:
-                self.log(f"Delete account failed: {response.text}", "FAIL")
-                self.record_test("Delete User Account", False, response.text)
-                return False
+            async with self.session.delete(ME_URL) as response:
+                
+                if response.status == 200:
+                    self.log("Account deleted successfully", "PASS")
+                    self.record_test("Delete User Account", True, "Account and all data deleted")
+                    return True
+                else:
+                    self.log(f"Delete account failed: {await response.text()}", "FAIL")
+                    self.record_test("Delete User Account", False, await response.text())
+                    return False
         except Exception as e:
             self.log(f"Delete account error: {str(e)}", "FAIL")
             self.record_test("Delete User Account", False, str(e))
@@ -436,118 +493,149 @@ class APITester:
     
     def generate_report(self):
         """Generate and display test report"""
-        print(f"\n{Colors.HEADER}{Colors.BOLD}{'='*80}")
-        print("                         COMPREHENSIVE API TEST REPORT")
-        print(f"{'='*80}{Colors.ENDC}\n")
-        
-        passed = sum(1 for t in self.test_results if t["passed"])
+        passed = sum(1 for _, test_passed, _, _ in self.test_results if test_passed)
         total = len(self.test_results)
         pass_rate = (passed / total * 100) if total > 0 else 0
         
-        print(f"{Colors.BOLD}Summary:{Colors.ENDC}")
-        print(f"  Total Tests: {total}")
-        print(f"  Passed: {Colors.OKGREEN}{passed}{Colors.ENDC}")
-        print(f"  Failed: {Colors.FAIL}{total - passed}{Colors.ENDC}")
-        print(f"  Pass Rate: {Colors.OKGREEN if pass_rate >= 90 else Colors.WARNING}{pass_rate:.1f}%{Colors.ENDC}\n")
+        # Build the whole report and write it to stdout once
+        lines = [
+            f"\n{Colors.HEADER}{Colors.BOLD}{'='*80}",
+            "                         COMPREHENSIVE API TEST REPORT",
+            f"{'='*80}{Colors.ENDC}\n",
+            f"{Colors.BOLD}Summary:{Colors.ENDC}",
+            f"  Total Tests: {total}",
+            f"  Passed: {Colors.OKGREEN}{passed}{Colors.ENDC}",
+            f"  Failed: {Colors.FAIL}{total - passed}{Colors.ENDC}",
+            f"  Pass Rate: {Colors.OKGREEN if pass_rate >= 90 else Colors.WARNING}{pass_rate:.1f}%{Colors.ENDC}\n",
+            f"{Colors.BOLD}Test Details:{Colors.ENDC}",
+        ]
         
-        print(f"{Colors.BOLD}Test Details:{Colors.ENDC}")
-        for result in self.test_results:
-            status_symbol = "✓" if result["passed"] else "✗"
-            status_color = Colors.OKGREEN if result["passed"] else Colors.FAIL
-            print(f"  {status_color}{status_symbol} {result['test']}{Colors.ENDC}")
-            if result["details"]:
-                print(f"    {Colors.OKBLUE}→ {result['details']}{Colors.ENDC}")
+        for test_name, test_passed, details, _ in self.test_results:
+            status_color, status_symbol = self._RESULT_STYLES[test_passed]
+            lines.append(f"  {status_color}{status_symbol} {test_name}{Colors.ENDC}")
+            if details:
+                lines.append(f"    {Colors.OKBLUE}→ {details}{Colors.ENDC}")
         
-        print(f"\n{Colors.HEADER}{'='*80}{Colors.ENDC}\n")
+        lines.append(f"\n{Colors.HEADER}{'='*80}{Colors.ENDC}\n")
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+
+def _orjson_dumps(obj) -> str:
+    """JSON encoder for aiohttp request bodies"""
+    return orjson.dumps(obj).decode()
+
+
+# One shared tester per event loop. aiohttp sessions and the model semaphore
+# are bound to the loop that created them, so a process-wide instance would
+# go stale as soon as asyncio.run() starts a new loop.
+_testers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, APITester]" = weakref.WeakKeyDictionary()
 
 
-def main():
+def _new_session() -> aiohttp.ClientSession:
+    """Create the HTTP session a tester sends its requests through"""
+    # One keep-alive connection pool for the whole run. DNS results are cached
+    # so runs against a remote BASE_URL don't resolve the host per connection.
+    connector = aiohttp.TCPConnector(limit=16, use_dns_cache=True, ttl_dns_cache=300)
+    
+    # Model inference can take minutes, so don't time out requests
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers={"Accept": "application/json"},
+        json_serialize=_orjson_dumps,
+        timeout=aiohttp.ClientTimeout(total=None),
+    )
+
+
+def get_tester() -> APITester:
+    """
+    Return the running event loop's shared APITester, creating it on first use.
+    Must be called from inside the loop; release it with close_tester().
+    """
+    loop = asyncio.get_running_loop()
+    tester = _testers.get(loop)
+    if tester is None or tester.session.closed:
+        tester = _testers[loop] = APITester(_new_session())
+    return tester
+
+
+async def close_tester():
+    """Close the running event loop's shared tester and its HTTP session"""
+    tester = _testers.pop(asyncio.get_running_loop(), None)
+    if tester is not None:
+        await tester.session.close()
+
+
+async def main():
     """Run comprehensive API tests"""
     print(f"\n{Colors.HEADER}{Colors.BOLD}Starting Comprehensive API Test Suite{Colors.ENDC}\n")
     
-    tester = APITester()
-    
+    # Close the session before asyncio.run() shuts the loop down
+    try:
+        await run_tests(get_tester())
+    finally:
+        await close_tester()
+
+
+async def run_tests(tester: APITester):
+    """Run all test phases against a single shared HTTP session"""
     # Test data
     test_email = f"test_user_{int(time.time())}@example.com"
     test_password = "SecurePassword123!"
     test_name = "API Test User"
     
-    # Available AI models to test
-    # Fast CPU models for demos (small size, quick responses)
-    fast_models = [
-        "qwen2.5:0.5b",    # 397 MB - FASTEST
-        "gemma2:2b",        # 1.6 GB - Very fast
-        "phi3:mini"         # 2.2 GB - Fast
-    ]
-    
-    # Full-size models (better quality, slower)
-    full_models = [
-        "llama3-groq-tool-use:8b",
-        "llama3:8b",
-        "qwen2.5:7b",
-        "mistral:7b"
-    ]
-    
-    # Test fast models first for demos, then full models
-    models = fast_models + full_models
-    
     print(f"{Colors.BOLD}Phase 1: User Authentication{Colors.ENDC}\n")
-    if not tester.test_signup(test_email, test_name, test_password):
+    if not await tester.test_signup(test_email, test_name, test_password):
         print(f"{Colors.FAIL}Signup failed - aborting tests{Colors.ENDC}")
         return
     
-    time.sleep(1)
-    tester.test_get_profile()
-    tester.test_update_profile()
+    await tester.test_get_profile()
+    await tester.test_update_profile()
     
     print(f"\n{Colors.BOLD}Phase 2: Project Management{Colors.ENDC}\n")
-    project_id = tester.test_create_project("Test Project", "Comprehensive API Testing")
+    project_id = await tester.test_create_project("Test Project", "Comprehensive API Testing")
     if project_id:
-        tester.test_get_projects()
+        await tester.test_get_projects()
     
     print(f"\n{Colors.BOLD}Phase 3: Conversations with AI Models (CPU + GPU){Colors.ENDC}\n")
-    conversation_ids = []
     if project_id:
-        # Test CPU models (fast, lightweight)
-        for model in ["qwen2.5:0.5b", "gemma2:2b"]:
-            tester.log(f"\nTesting CPU model: {model}...", "INFO")
-            conv_id = tester.test_create_conversation(
-                project_id,
-                model,
-                f"Hello! Please respond with a simple greeting. This is a test of the {model} model.",
-                use_gpu=False
-            )
-            if conv_id:
-                conversation_ids.append(conv_id)
-                time.sleep(2)
-                tester.test_get_conversation_messages(conv_id)
+        # CPU models (fast, lightweight) and GPU models (better quality, GPU accelerated)
+        # are independent, so run all conversations concurrently
+        model_runs = [
+            ("qwen2.5:0.5b", False),
+            ("gemma2:2b", False),
+            ("llama3:8b", True),
+            ("qwen2.5:7b", True),
+        ]
         
-        # Test GPU models (better quality, GPU accelerated)
-        for model in ["llama3:8b", "qwen2.5:7b"]:
-            tester.log(f"\nTesting GPU model: {model}...", "INFO")
-            conv_id = tester.test_create_conversation(
-                project_id,
-                model,
-                f"Hello! Please respond with a simple greeting. This is a test of the {model} model.",
-                use_gpu=True
-            )
-            if conv_id:
-                conversation_ids.append(conv_id)
-                time.sleep(2)
-                tester.test_get_conversation_messages(conv_id)
+        # Skip models Ollama hasn't pulled; each missing model can stall for
+        # tens of seconds before failing
+        available = await tester.get_available_models()
+        if available is not None:
+            for model, _ in model_runs:
+                if model not in available:
+                    tester.log(f"Skipping {model} - not available in Ollama", "INFO")
+            model_runs = [(model, use_gpu) for model, use_gpu in model_runs if model in available]
+        
+        # The first run uses the plain JSON /chat response so ChatService.chat
+        # keeps end-to-end coverage alongside the SSE path
+        await asyncio.gather(*[
+            tester.test_model_conversation(project_id, model, use_gpu, stream=i > 0)
+            for i, (model, use_gpu) in enumerate(model_runs)
+        ])
     
     print(f"\n{Colors.BOLD}Phase 4: Statistics & Overview{Colors.ENDC}\n")
-    tester.test_get_stats()
+    await tester.test_get_stats()
     
     print(f"\n{Colors.BOLD}Phase 5: Cleanup{Colors.ENDC}\n")
     if project_id:
-        tester.test_delete_project(project_id)
+        await tester.test_delete_project(project_id)
     
-    tester.test_delete_account()
+    await tester.test_delete_account()
     
     # Generate final report
     tester.generate_report()
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
@@ -8,13 +8,18 @@ This module provides reusable fixtures for testing including:
 - Authentication helpers
 """
 
+import os
 import pytest
-from datetime import datetime
-from typing import Generator
-from sqlalchemy import create_engine
-from sqlalchemy.orm import Session, sessionmaker
+from contextlib import contextmanager
+from unittest.mock import AsyncMock, MagicMock
+from typing import Any, AsyncIterator, Dict, Generator, Optional
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.dialects import sqlite
+from sqlalchemy.orm import Session, close_all_sessions
 from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateIndex, CreateTable
 
+from src.core.interfaces import ILLMProvider
 from src.models.database import Base, User, Project, Conversation, Message, Document
 from src.repositories.project_repository import ProjectRepository
 from src.repositories.conversation_repository import ConversationRepository
@@ -22,57 +27,117 @@ from src.repositories.message_repository import MessageRepository
 from src.repositories.document_repository import DocumentRepository
 
 
+# Schema DDL compiled once at import and replayed with executescript(),
+# skipping create_all()'s per-table inspection and compilation
+SCHEMA_DDL = "\n".join(
+    f"{ddl.compile(dialect=sqlite.dialect())};"
+    for table in Base.metadata.sorted_tables
+    for ddl in (CreateTable(table), *(CreateIndex(index) for index in table.indexes))
+)
+
+
 @pytest.fixture(scope="session")
 def test_engine():
-    """Create an in-memory SQLite engine for testing"""
+    """Create an in-memory SQLite engine for testing
+    
+    Each pytest-xdist worker gets its own named in-memory database, so
+    workers never see each other's rows.
+    """
+    worker_id = os.environ.get("PYTEST_XDIST_WORKER", "gw0")
     engine = create_engine(
-        "sqlite:///:memory:",
-        connect_args={"check_same_thread": False},
+        f"sqlite+pysqlite:///file:sb_{worker_id}?mode=memory&cache=shared&uri=true",
+        connect_args={"uri": True, "check_same_thread": False},
         poolclass=StaticPool,
     )
-    Base.metadata.create_all(engine)
+    
+    # The test DB is throwaway; skip durability work on every commit
+    @event.listens_for(engine, "connect")
+    def _fast_sqlite(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+    
+    # pysqlite defers BEGIN on its own, which breaks SAVEPOINT and lets the
+    # per-test rollback in test_db silently do nothing; emit BEGIN ourselves
+    @event.listens_for(engine, "connect")
+    def _disable_pysqlite_begin(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+    
+    @event.listens_for(engine, "begin")
+    def _emit_begin(conn):
+        conn.exec_driver_sql("BEGIN")
+    
+    # Every worker owns its database, so each one creates its own schema;
+    # there is no shared DB to race on and no cross-worker lock is needed
+    raw_connection = engine.raw_connection()
+    try:
+        raw_connection.executescript(SCHEMA_DDL)
+        raw_connection.commit()
+    finally:
+        raw_connection.close()
+    
     yield engine
-    Base.metadata.drop_all(engine)
+    
+    # The in-memory database disappears with its last connection, so closing
+    # everything replaces a DROP TABLE per table
+    close_all_sessions()
+    engine.dispose()
 
 
 @pytest.fixture(scope="function")
 def test_db(test_engine) -> Generator[Session, None, None]:
-    """Create a new database session for each test"""
-    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
-    session = TestSessionLocal()
+    """Create a new database session for each test, rolled back afterwards"""
+    connection = test_engine.connect()
+    transaction = connection.begin()
+    # Commits inside the test only release a SAVEPOINT; the outer
+    # transaction is rolled back on teardown, discarding everything
+    session = Session(
+        bind=connection,
+        autoflush=True,
+        expire_on_commit=False,
+        join_transaction_mode="create_savepoint",
+    )
     
     try:
         yield session
     finally:
-        # Clean up all data after test
-        session.query(Message).delete()
-        session.query(Conversation).delete()
-        session.query(Document).delete()
-        session.query(Project).delete()
-        session.query(User).delete()
-        session.commit()
         session.close()
+        transaction.rollback()
+        connection.close()
 
 
-@pytest.fixture
-def test_user(test_db: Session) -> User:
-    """Create a test user"""
+@pytest.fixture(scope="session")
+def password_hash() -> str:
+    """Password hash for seeded users, computed once per session
+    
+    A placeholder today; if this becomes a real Argon2 hash, the KDF still
+    only runs once instead of once per test.
+    """
+    return "$argon2id$v=19$m=65536,t=3,p=4$test"
+
+
+@pytest.fixture(scope="session")
+def _seed_db(test_engine, password_hash: str) -> Dict[str, Any]:
+    """Insert the shared user/project/conversation/document rows once per session
+    
+    Returns detached instances keyed by name. Tests get attached copies through
+    the test_user/test_project/... fixtures, and any changes they make are
+    rolled back with test_db, so the seeded rows stay as created here.
+    """
+    session = Session(bind=test_engine, expire_on_commit=False)
+    
     user = User(
         email="test@example.com",
         name="Test User",
-        password_hash="$argon2id$v=19$m=65536,t=3,p=4$test",  # Placeholder hash
+        password_hash=password_hash,
     )
-    test_db.add(user)
-    test_db.commit()  # Commit so it's visible across sessions
-    test_db.refresh(user)
-    return user
-
-
-@pytest.fixture
-def test_project(test_db: Session, test_user: User) -> Project:
-    """Create a test project"""
+    session.add(user)
+    session.flush()
+    
     project = Project(
-        user_id=test_user.id,
+        user_id=user.id,
         name="Test Project",
         description="A test project for unit testing",
         color="#3b82f6",
@@ -80,24 +145,50 @@ def test_project(test_db: Session, test_user: User) -> Project:
         system_prompt="You are a helpful test assistant.",
         tools=["calculator", "web_search"],
     )
-    test_db.add(project)
-    test_db.commit()
-    test_db.refresh(project)
-    return project
-
-
-@pytest.fixture
-def test_conversation(test_db: Session, test_project: Project) -> Conversation:
-    """Create a test conversation"""
+    session.add(project)
+    session.flush()
+    
     conversation = Conversation(
-        project_id=test_project.id,
+        project_id=project.id,
         title="Test Conversation",
         total_tokens=0,
     )
-    test_db.add(conversation)
-    test_db.commit()
-    test_db.refresh(conversation)
-    return conversation
+    document = Document(
+        project_id=project.id,
+        filename="test_document.pdf",
+        file_type="application/pdf",
+        file_path="/tmp/test_document.pdf",
+        file_size=1024,
+        summary="A test document for unit testing",
+    )
+    session.add_all([conversation, document])
+    session.commit()
+    session.close()
+    
+    return {
+        "user": user,
+        "project": project,
+        "conversation": conversation,
+        "document": document,
+    }
+
+
+@pytest.fixture
+def test_user(test_db: Session, _seed_db: Dict[str, Any]) -> User:
+    """Provide the seeded test user"""
+    return test_db.merge(_seed_db["user"], load=False)
+
+
+@pytest.fixture
+def test_project(test_db: Session, _seed_db: Dict[str, Any], test_user: User) -> Project:
+    """Provide the seeded test project"""
+    return test_db.merge(_seed_db["project"], load=False)
+
+
+@pytest.fixture
+def test_conversation(test_db: Session, _seed_db: Dict[str, Any], test_project: Project) -> Conversation:
+    """Provide the seeded test conversation"""
+    return test_db.merge(_seed_db["conversation"], load=False)
 
 
 @pytest.fixture
@@ -110,26 +201,38 @@ def test_message(test_db: Session, test_conversation: Conversation) -> Message:
         message_type="text",
     )
     test_db.add(message)
-    test_db.commit()
-    test_db.refresh(message)
+    test_db.flush()
     return message
 
 
 @pytest.fixture
-def test_document(test_db: Session, test_project: Project) -> Document:
-    """Create a test document"""
-    document = Document(
-        project_id=test_project.id,
-        filename="test_document.pdf",
-        file_type="application/pdf",
-        file_path="/tmp/test_document.pdf",
-        file_size=1024,
-        summary="A test document for unit testing",
-    )
-    test_db.add(document)
-    test_db.commit()
-    test_db.refresh(document)
-    return document
+def test_document(test_db: Session, _seed_db: Dict[str, Any], test_project: Project) -> Document:
+    """Provide the seeded test document"""
+    return test_db.merge(_seed_db["document"], load=False)
+
+
+@pytest.fixture
+def count_queries(test_db: Session):
+    """Context manager that records the SQL statements test_db executes
+    
+    Usage: ``with count_queries() as statements: ...`` then assert on
+    ``len(statements)`` to catch N+1 lazy loads.
+    """
+    @contextmanager
+    def _count_queries():
+        statements = []
+        
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+        
+        connection = test_db.connection()
+        event.listen(connection, "before_cursor_execute", _record)
+        try:
+            yield statements
+        finally:
+            event.remove(connection, "before_cursor_execute", _record)
+    
+    return _count_queries
 
 
 # Repository fixtures
@@ -158,28 +261,46 @@ def document_repo(test_db: Session) -> DocumentRepository:
 
 
 # Mock provider fixtures
-@pytest.fixture
-def mock_llm_provider(mocker):
-    """Mock LLM provider for testing"""
-    from unittest.mock import AsyncMock
+MOCK_STREAM_CHUNKS = ("Mocked ", "streamed ", "response")
+
+
+class StubLLMProvider(ILLMProvider):
+    """LLM provider stand-in that records calls in plain lists
     
-    mock = mocker.MagicMock()
-    # Use AsyncMock for async methods
-    mock.generate = AsyncMock(return_value="Mocked LLM response")
+    Cheaper than an AsyncMock: no call-args introspection, and each
+    generate_stream() call is a fresh async generator over fixed chunks.
+    """
     
-    # For async generator, create a mock that returns an async generator
-    async def mock_stream_gen(*args, **kwargs):
-        for chunk in ["Mocked ", "streamed ", "response"]:
-            yield chunk
-    mock.generate_stream = mocker.MagicMock(return_value=mock_stream_gen())
+    def __init__(self, response: str = "Mocked LLM response"):
+        self.response = response
+        self.calls: list[tuple[str, dict]] = []
+        self.stream_calls: list[tuple[str, dict]] = []
     
-    return mock
+    async def generate(self, prompt: str, system_prompt: Optional[str] = None, **kwargs: Any) -> str:
+        self.calls.append((prompt, kwargs))
+        return self.response
+    
+    async def generate_stream(
+        self, prompt: str, system_prompt: Optional[str] = None, **kwargs: Any
+    ) -> AsyncIterator[str]:
+        self.stream_calls.append((prompt, kwargs))
+        for chunk in MOCK_STREAM_CHUNKS:
+            yield chunk
+
+
+@pytest.fixture
+def mock_llm_provider() -> StubLLMProvider:
+    """Stub LLM provider for testing"""
+    return StubLLMProvider()
 
 
 @pytest.fixture
-def mock_vector_store(mocker):
+def mock_vector_store():
     """Mock vector store for testing"""
-    mock = mocker.MagicMock()
+    # Built per test so overridden return values can't leak into later tests
+    mock = MagicMock()
+    # Use AsyncMock for the async IVectorStore methods
+    mock.add_documents = AsyncMock(return_value=None)
     mock.add_document.return_value = "doc_id_123"
     mock.similarity_search.return_value = [
         {"content": "Relevant content 1", "score": 0.9},
@@ -190,6 +311,24 @@ def mock_vector_store(mocker):
 
 
 # Data factory helpers
+# Built once; bulk_create() runs these with a list of parameter dicts and
+# relies on the returned IDs lining up with that list
+PROJECT_INSERT = insert(Project).returning(Project.id, sort_by_parameter_order=True)
+CONVERSATION_INSERT = insert(Conversation).returning(Conversation.id, sort_by_parameter_order=True)
+
+# Immutable column defaults shared by the factories. Mutable values such as
+# the tools list are built per call so tests can't leak changes to each other
+PROJECT_DEFAULTS = {
+    "description": "Test description",
+    "color": "#3b82f6",
+    "agent_name": "Test Agent",
+    "system_prompt": "Test prompt",
+}
+CONVERSATION_DEFAULTS = {
+    "total_tokens": 0,
+}
+
+
 class ProjectFactory:
     """Factory for creating test projects"""
     
@@ -201,20 +340,28 @@ class ProjectFactory:
         **kwargs
     ) -> Project:
         """Create a project with default or custom values"""
-        defaults = {
-            "description": "Test description",
-            "color": "#3b82f6",
-            "agent_name": "Test Agent",
-            "system_prompt": "Test prompt",
-            "tools": ["calculator"],
-        }
-        defaults.update(kwargs)
+        defaults = {**PROJECT_DEFAULTS, "tools": ["calculator"], **kwargs}
         
         project = Project(user_id=user_id, name=name, **defaults)
         db.add(project)
-        db.commit()
-        db.refresh(project)
+        db.flush()
         return project
+    
+    @staticmethod
+    def bulk_create(
+        db: Session,
+        user_id: int,
+        names: list[str],
+        **kwargs
+    ) -> list[int]:
+        """Insert several projects in one batch and return their IDs"""
+        defaults = {**PROJECT_DEFAULTS, **kwargs}
+        
+        rows = [
+            {"user_id": user_id, "name": name, "tools": ["calculator"], **defaults}
+            for name in names
+        ]
+        return list(db.scalars(PROJECT_INSERT, rows))
 
 
 class ConversationFactory:
@@ -228,16 +375,25 @@ class ConversationFactory:
         **kwargs
     ) -> Conversation:
         """Create a conversation with default or custom values"""
-        defaults = {
-            "total_tokens": 0,
-        }
-        defaults.update(kwargs)
+        defaults = {**CONVERSATION_DEFAULTS, **kwargs}
         
         conversation = Conversation(project_id=project_id, title=title, **defaults)
         db.add(conversation)
-        db.commit()
-        db.refresh(conversation)
+        db.flush()
         return conversation
+    
+    @staticmethod
+    def bulk_create(
+        db: Session,
+        project_id: int,
+        titles: list[str],
+        **kwargs
+    ) -> list[int]:
+        """Insert several conversations in one batch and return their IDs"""
+        defaults = {**CONVERSATION_DEFAULTS, **kwargs}
+        
+        rows = [{"project_id": project_id, "title": title, **defaults} for title in titles]
+        return list(db.scalars(CONVERSATION_INSERT, rows))
 
 
 @pytest.fixture
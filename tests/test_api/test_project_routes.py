@@ -1,32 +1,27 @@
 """Tests for project API routes"""
 
 import pytest
-from fastapi.testclient import TestClient
-from src.app import app
-from src.models.database import get_db
+from httpx import ASGITransport, AsyncClient
 
 
 @pytest.fixture
-def client(test_db, test_engine):
-    """Create a test client with test database"""
-    from sqlalchemy.orm import sessionmaker
-    
-    # Use the same engine for both test and app
-    TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+async def client(test_db):
+    """Async client calling the app in-process, backed by the test database session"""
+    # Imported here so collection doesn't pay for the app's startup imports
+    from src.app import app
+    from src.models.database import get_db
     
     def override_get_db():
-        db = TestSessionLocal()
-        try:
-            yield db
-        finally:
-            db.close()
+        yield test_db
     
     app.dependency_overrides[get_db] = override_get_db
     
-    with TestClient(app) as client:
-        yield client
-    
-    app.dependency_overrides.clear()
+    # ASGITransport calls the app directly: no server thread and no lifespan run
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            yield client
+    finally:
+        app.dependency_overrides.pop(get_db, None)
 
 
 @pytest.mark.integration
@@ -54,13 +49,13 @@ class TestProjectRoutes:
     #     assert data["id"] == test_project.id
     #     assert data["name"] == test_project.name
     
-    def test_get_project_not_found(self, client):
+    async def test_get_project_not_found(self, client):
         """Test GET /projects/{id} with non-existent ID returns 404"""
-        response = client.get("/api/v1/projects/99999")
+        response = await client.get("/api/v1/projects/99999")
         
         assert response.status_code == 404
     
-    def test_create_project_success(self, client):
+    async def test_create_project_success(self, client):
         """Test POST /projects creates new project"""
         project_data = {
             "name": "New API Project",
@@ -71,7 +66,7 @@ class TestProjectRoutes:
             "tools": ["calculator"]
         }
         
-        response = client.post("/api/v1/projects", json=project_data)
+        response = await client.post("/api/v1/projects", json=project_data)
         
         assert response.status_code == 201
         data = response.json()
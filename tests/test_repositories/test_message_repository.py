@@ -1,6 +1,7 @@
 """Tests for MessageRepository"""
 
 import pytest
+from datetime import datetime, timedelta
 from src.models.database import Message
 from src.repositories.message_repository import MessageRepository
 
@@ -9,42 +10,18 @@ from src.repositories.message_repository import MessageRepository
 class TestMessageRepository:
     """Test suite for MessageRepository"""
     
-    def test_create_message(self, message_repo: MessageRepository, test_conversation):
-        """Test creating a new message"""
-        message = Message(
-            conversation_id=test_conversation.id,
-            role="user",
-            content="Test message",
-            message_type="text",
-        )
-        
-        created = message_repo.create(message)
-        
-        assert created.id is not None
-        assert created.content == "Test message"
-        assert created.role == "user"
-        assert created.conversation_id == test_conversation.id
-        assert created.created_at is not None
-    
-    def test_find_by_id(self, message_repo: MessageRepository, test_message):
-        """Test finding message by ID"""
-        found = message_repo.find_by_id(test_message.id)
-        
-        assert found is not None
-        assert found.id == test_message.id
-        assert found.content == test_message.content
-    
     def test_find_by_conversation(self, message_repo: MessageRepository, test_db, test_conversation):
         """Test finding all messages in a conversation"""
         # Create multiple messages
-        for i in range(3):
-            msg = Message(
+        test_db.add_all([
+            Message(
                 conversation_id=test_conversation.id,
                 role="user" if i % 2 == 0 else "assistant",
                 content=f"Message {i}",
                 message_type="text"
             )
-            test_db.add(msg)
+            for i in range(3)
+        ])
         test_db.commit()
         
         messages = message_repo.find_by_conversation(test_conversation.id)
@@ -55,50 +32,69 @@ class TestMessageRepository:
         for i in range(len(messages) - 1):
             assert messages[i].created_at <= messages[i + 1].created_at
     
-    def test_update_message(self, message_repo: MessageRepository, test_db, test_message):
-        """Test updating a message"""
-        test_message.content = "Updated content"
-        test_db.commit()
+    def test_bulk_create(self, message_repo: MessageRepository, test_conversation):
+        """Test inserting several messages with one commit"""
+        previous_updated_at = test_conversation.updated_at
         
-        updated = message_repo.find_by_id(test_message.id)
+        created = message_repo.bulk_create([
+            Message(
+                conversation_id=test_conversation.id,
+                role=role,
+                content=f"{role} message",
+                message_type="text"
+            )
+            for role in ("user", "assistant")
+        ])
         
-        assert updated.content == "Updated content"
+        assert all(m.id is not None for m in created)
+        stored = message_repo.find_by_conversation(test_conversation.id)
+        assert sorted(m.role for m in stored) == ["assistant", "user"]
+        assert test_conversation.updated_at >= previous_updated_at
     
-    def test_delete_message(self, message_repo: MessageRepository, test_db, test_conversation):
-        """Test deleting a message"""
-        message = Message(
-            conversation_id=test_conversation.id,
-            role="user",
-            content="To delete",
-            message_type="text"
-        )
-        created = message_repo.create(message)
+    def test_bulk_create_reloads_in_one_query(self, message_repo: MessageRepository, test_db, test_conversation, count_queries):
+        """Test bulk-created messages come back loaded, not expired one by one"""
+        # Match production sessions, where commit() expires every instance
+        test_db.expire_on_commit = True
+        messages = [
+            Message(
+                conversation_id=test_conversation.id,
+                role="user",
+                content=f"Message {i}",
+                message_type="text"
+            )
+            for i in range(5)
+        ]
         
-        result = message_repo.delete(created.id)
+        with count_queries() as statements:
+            created = message_repo.bulk_create(messages)
+            reload_count = len(statements)
+            contents = [m.content for m in created]
         
-        assert result is True
-        assert message_repo.find_by_id(created.id) is None
+        assert contents == [f"Message {i}" for i in range(5)]
+        # Reading attributes after bulk_create issues no further queries
+        assert len(statements) == reload_count
     
-    def test_message_ordering(self, message_repo: MessageRepository, test_db, test_conversation):
+    def test_message_ordering(self, message_repo: MessageRepository, test_conversation):
         """Test that messages are returned in chronological order"""
-        import time
-        
-        # Create messages with slight delays
+        # Stamp created_at explicitly instead of sleeping between inserts
+        base = datetime.utcnow()
         message_ids = []
         for i in range(3):
             msg = Message(
                 conversation_id=test_conversation.id,
                 role="user",
                 content=f"Message {i}",
-                message_type="text"
+                message_type="text",
+                created_at=base + timedelta(milliseconds=i)
             )
             created = message_repo.create(msg)
             message_ids.append(created.id)
-            if i < 2:
-                time.sleep(0.01)  # Small delay
         
         messages = message_repo.find_by_conversation(test_conversation.id)
         retrieved_ids = [m.id for m in messages]
         
         # Should be in chronological order
         assert retrieved_ids == message_ids
+        assert [m.created_at for m in messages] == [
+            base + timedelta(milliseconds=i) for i in range(3)
+        ]
@@ -5,9 +5,10 @@ Tests CRUD operations and business logic for Project entities.
 """
 
 import pytest
+from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 
-from src.models.database import Project
+from src.models.database import Conversation, Document, Message, Project
 from src.repositories.project_repository import ProjectRepository
 
 
@@ -15,36 +16,6 @@ from src.repositories.project_repository import ProjectRepository
 class TestProjectRepository:
     """Test suite for ProjectRepository"""
     
-    def test_create_project(self, project_repo: ProjectRepository, test_user):
-        """Test creating a new project"""
-        project = Project(
-            user_id=test_user.id,
-            name="New Project",
-            description="Test description",
-            color="#ff0000",
-            agent_name="Agent",
-            system_prompt="Prompt",
-            tools=["calculator"],
-        )
-        
-        created = project_repo.create(project)
-        
-        assert created.id is not None
-        assert created.name == "New Project"
-        assert created.user_id == test_user.id
-        assert created.color == "#ff0000"
-        assert created.tools == ["calculator"]
-        assert created.created_at is not None
-        assert created.updated_at is not None
-    
-    def test_find_by_id_existing(self, project_repo: ProjectRepository, test_project):
-        """Test finding an existing project by ID"""
-        found = project_repo.find_by_id(test_project.id)
-        
-        assert found is not None
-        assert found.id == test_project.id
-        assert found.name == test_project.name
-    
     def test_find_by_id_nonexistent(self, project_repo: ProjectRepository):
         """Test finding a non-existent project returns None"""
         found = project_repo.find_by_id(99999)
@@ -53,80 +24,93 @@ class TestProjectRepository:
     
     def test_find_by_user(self, project_repo: ProjectRepository, test_db: Session, test_user, project_factory):
         """Test finding all projects for a user"""
-        # Create multiple projects
-        project_factory.create(test_db, test_user.id, name="Project 1")
-        project_factory.create(test_db, test_user.id, name="Project 2")
-        project_factory.create(test_db, test_user.id, name="Project 3")
+        # Stamp updated_at explicitly so the expected order doesn't depend on the clock
+        base = datetime(2024, 1, 1)
+        for i, name in enumerate(["Project 1", "Project 2", "Project 3"]):
+            project_factory.create(test_db, test_user.id, name=name, updated_at=base + timedelta(minutes=i))
         
         projects = project_repo.find_by_user(test_user.id)
         
         assert len(projects) >= 3
         assert all(p.user_id == test_user.id for p in projects)
         # Should be ordered by updated_at DESC
-        assert projects[0].updated_at >= projects[-1].updated_at
+        assert [p.name for p in projects if p.name.startswith("Project ")] == [
+            "Project 3", "Project 2", "Project 1"
+        ]
+    
+    @pytest.mark.parametrize("project_count", [2, 5])
+    def test_find_by_user_with_counts_query_count(self, project_repo: ProjectRepository, test_db: Session, test_user, project_factory, conversation_factory, count_queries, project_count):
+        """Test listing projects with stats takes one query however many projects there are"""
+        project_ids = project_factory.bulk_create(test_db, test_user.id, [f"Project {i}" for i in range(project_count)])
+        for project_id in project_ids:
+            conversation_factory.bulk_create(test_db, project_id, ["Conv"])
+        user_id = test_user.id
+        test_db.expire_all()
+        
+        # Read every field the project list route puts in its response
+        with count_queries() as statements:
+            rows = project_repo.find_by_user_with_counts(user_id)
+            for p, *_counts in rows:
+                (p.id, p.name, p.description, p.color, p.agent_name, p.system_prompt,
+                 p.tools, p.user_id, p.created_at, p.updated_at)
+        
+        assert len(rows) >= project_count
+        assert len(statements) == 1
+    
+    def test_find_by_user_with_counts(self, project_repo: ProjectRepository, test_db: Session, test_user, project_factory, conversation_factory):
+        """Test projects come back with their conversation, message and document counts"""
+        busy_id, empty_id = project_factory.bulk_create(test_db, test_user.id, ["Busy", "Empty"])
+        conversation_ids = conversation_factory.bulk_create(test_db, busy_id, ["Conv 1", "Conv 2"])
+        test_db.add_all([
+            Message(conversation_id=conversation_id, role="user", content="Hi")
+            for conversation_id in conversation_ids + conversation_ids[:1]
+        ])
+        test_db.add(Document(project_id=busy_id, filename="a.pdf", file_type="application/pdf", file_path="/tmp/a.pdf"))
+        test_db.commit()
+        
+        counts = {
+            project.id: (conversations, messages, documents)
+            for project, conversations, messages, documents in project_repo.find_by_user_with_counts(test_user.id)
+        }
+        
+        assert counts[busy_id] == (2, 3, 1)
+        assert counts[empty_id] == (0, 0, 0)
     
     def test_find_all(self, project_repo: ProjectRepository, test_db: Session, test_user, project_factory):
         """Test finding all projects"""
         initial_count = len(project_repo.find_all())
         
         # Create test projects
-        project_factory.create(test_db, test_user.id, name="Project A")
-        project_factory.create(test_db, test_user.id, name="Project B")
+        project_factory.bulk_create(test_db, test_user.id, ["Project A", "Project B"])
         
         all_projects = project_repo.find_all()
         
         assert len(all_projects) == initial_count + 2
     
-    def test_update_project(self, project_repo: ProjectRepository, test_project):
-        """Test updating a project"""
-        test_project.name = "Updated Name"
-        test_project.description = "Updated description"
-        
-        updated = project_repo.update(test_project)
-        
-        assert updated.name == "Updated Name"
-        assert updated.description == "Updated description"
-        # updated_at should be refreshed
-        assert updated.updated_at is not None
-    
-    def test_delete_project(self, project_repo: ProjectRepository, test_db: Session, test_user):
-        """Test deleting a project"""
-        # Create a project to delete
-        project = Project(
-            user_id=test_user.id,
-            name="To Delete",
-            description="Will be deleted",
-        )
-        created = project_repo.create(project)
-        project_id = created.id
-        
-        # Delete it
-        result = project_repo.delete(project_id)
-        
-        assert result is True
-        # Verify it's gone
-        found = project_repo.find_by_id(project_id)
-        assert found is None
-    
     def test_delete_nonexistent_project(self, project_repo: ProjectRepository):
         """Test deleting a non-existent project returns False"""
         result = project_repo.delete(99999)
         
         assert result is False
     
-    def test_project_cascade_delete_conversations(self, project_repo: ProjectRepository, test_db: Session, test_project, conversation_factory):
+    @pytest.mark.parametrize("conversation_count", [2, 5])
+    def test_project_cascade_delete_conversations(self, project_repo: ProjectRepository, test_db: Session, test_project, conversation_factory, count_queries, conversation_count):
         """Test that deleting a project cascades to conversations"""
+        project_id = test_project.id
         # Create conversations
-        conversation_factory.create(test_db, test_project.id, title="Conv 1")
-        conversation_factory.create(test_db, test_project.id, title="Conv 2")
+        conversation_factory.bulk_create(test_db, project_id, [f"Conv {i}" for i in range(conversation_count)])
+        test_db.expire_all()
+        
+        # Delete project; loading the cascade must not cost a query per conversation
+        with count_queries() as statements:
+            project_repo.delete(project_id)
         
-        # Delete project
-        project_repo.delete(test_project.id)
+        selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+        assert len(selects) <= 4
         
         # Verify conversations are also deleted (cascade)
-        from src.models.database import Conversation
         remaining_convs = test_db.query(Conversation).filter(
-            Conversation.project_id == test_project.id
+            Conversation.project_id == project_id
         ).all()
         
         assert len(remaining_convs) == 0
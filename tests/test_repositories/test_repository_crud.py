@@ -0,0 +1,106 @@
+"""
+Table-driven CRUD tests shared by all repositories
+
+Each case runs the same create -> find_by_id -> update -> delete round trip,
+replacing the near-identical per-repository copies of those tests.
+"""
+
+import pytest
+from datetime import datetime
+from src.models.database import Conversation, Document, Message, Project
+
+
+# Stamped on seeded rows that track updated_at, so the test can check update() advances it
+STALE_UPDATED_AT = datetime(2024, 1, 1)
+
+# (repo fixture, model, parent fixture, foreign key, sample kwargs, updated fields)
+CRUD_CASES = {
+    "project": (
+        "project_repo", Project, "test_user", "user_id",
+        {
+            "name": "New Project",
+            "description": "Test description",
+            "color": "#ff0000",
+            "agent_name": "Agent",
+            "system_prompt": "Prompt",
+            "tools": ["calculator"],
+            "updated_at": STALE_UPDATED_AT,
+        },
+        {"name": "Updated Name", "description": "Updated description"},
+    ),
+    "conversation": (
+        "conversation_repo", Conversation, "test_project", "project_id",
+        {"title": "Test Conversation", "total_tokens": 100},
+        {"title": "Updated Title", "total_tokens": 500},
+    ),
+    "document": (
+        "document_repo", Document, "test_project", "project_id",
+        {
+            "filename": "test.pdf",
+            "file_type": "application/pdf",
+            "file_path": "/tmp/test.pdf",
+            "file_size": 1024,
+            "summary": "Test document",
+        },
+        {"summary": "Updated summary", "file_size": 2048},
+    ),
+    "message": (
+        "message_repo", Message, "test_conversation", "conversation_id",
+        {"role": "user", "content": "Test message", "message_type": "text"},
+        {"content": "Updated content"},
+    ),
+}
+
+
+@pytest.fixture(params=list(CRUD_CASES), ids=list(CRUD_CASES))
+def crud_case(request):
+    """Resolve one CRUD case into (repo, model, kwargs, updates)"""
+    repo_name, model, parent_name, foreign_key, sample_kwargs, updates = CRUD_CASES[request.param]
+    repo = request.getfixturevalue(repo_name)
+    parent = request.getfixturevalue(parent_name)
+    return repo, model, {foreign_key: parent.id, **sample_kwargs}, updates
+
+
+@pytest.mark.unit
+class TestRepositoryCrud:
+    """Test suite for the CRUD operations every repository provides"""
+    
+    def test_create_find_update_delete_roundtrip(self, crud_case, test_db):
+        """Test creating, finding, updating and deleting an entity"""
+        repo, model, kwargs, updates = crud_case
+        
+        created = repo.create(model(**kwargs))
+        
+        assert created.id is not None
+        assert created.created_at is not None
+        for key, value in kwargs.items():
+            assert getattr(created, key) == value
+        
+        # Drop cached state so every field is read back from the database
+        test_db.expire_all()
+        found = repo.find_by_id(created.id)
+        
+        assert found is not None
+        assert found.id == created.id
+        for key, value in kwargs.items():
+            assert getattr(found, key) == value
+        
+        for key, value in updates.items():
+            setattr(found, key, value)
+        # MessageRepository has no update(); messages are saved with a commit
+        if hasattr(repo, "update"):
+            repo.update(found)
+        else:
+            test_db.commit()
+        
+        test_db.expire_all()
+        updated = repo.find_by_id(created.id)
+        expected = {**kwargs, **updates}
+        if "updated_at" in kwargs:
+            # updated_at is bumped by the update, not kept from the seed
+            assert updated.updated_at > expected.pop("updated_at")
+        for key, value in expected.items():
+            assert getattr(updated, key) == value
+        
+        assert repo.delete(created.id) is True
+        assert repo.find_by_id(created.id) is None
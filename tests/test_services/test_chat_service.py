@@ -1,8 +1,8 @@
 """Tests for ChatService"""
 
 import pytest
-from unittest.mock import MagicMock, AsyncMock
 
+from src.models.database import Message
 from src.services.chat_service import ChatService
 from src.models.schemas import ChatRequest
 
@@ -29,7 +29,6 @@ class TestChatService:
             vector_store=mock_vector_store
         )
     
-    @pytest.mark.asyncio
     async def test_chat_creates_new_conversation(
         self,
         chat_service,
@@ -50,9 +49,8 @@ class TestChatService:
         assert response.message.content == "Hello, AI!"
         assert response.message.role == "user"
         assert response.response.role == "assistant"
-        mock_llm_provider.generate.assert_called_once()
+        assert len(mock_llm_provider.calls) == 1
     
-    @pytest.mark.asyncio
     async def test_chat_uses_existing_conversation(
         self,
         chat_service,
@@ -70,9 +68,28 @@ class TestChatService:
         response = await chat_service.chat(request)
         
         assert response.conversation_id == test_conversation.id
-        mock_llm_provider.generate.assert_called_once()
+        assert len(mock_llm_provider.calls) == 1
+    
+    async def test_chat_adds_message_tokens_to_conversation_total(
+        self,
+        chat_service,
+        test_conversation
+    ):
+        """Test that the conversation total grows by both messages' token counts"""
+        previous_total = test_conversation.total_tokens
+        request = ChatRequest(
+            project_id=test_conversation.project_id,
+            message="Count my tokens",
+            conversation_id=test_conversation.id,
+            stream=False
+        )
+        
+        response = await chat_service.chat(request)
+        
+        assert test_conversation.total_tokens == (
+            previous_total + response.message.token_count + response.response.token_count
+        )
     
-    @pytest.mark.asyncio
     async def test_chat_includes_conversation_history(
         self,
         chat_service,
@@ -82,19 +99,20 @@ class TestChatService:
     ):
         """Test that conversation history is included in LLM context"""
         # Add some history
-        from src.models.database import Message
-        message_repo.create(Message(
-            conversation_id=test_conversation.id,
-            role="user",
-            content="Previous question",
-            message_type="text"
-        ))
-        message_repo.create(Message(
-            conversation_id=test_conversation.id,
-            role="assistant",
-            content="Previous answer",
-            message_type="text"
-        ))
+        message_repo.bulk_create([
+            Message(
+                conversation_id=test_conversation.id,
+                role="user",
+                content="Previous question",
+                message_type="text"
+            ),
+            Message(
+                conversation_id=test_conversation.id,
+                role="assistant",
+                content="Previous answer",
+                message_type="text"
+            ),
+        ])
         
         request = ChatRequest(
             project_id=test_conversation.project_id,
@@ -106,14 +124,14 @@ class TestChatService:
         response = await chat_service.chat(request)
         
         # Verify LLM was called with history
-        call_args = mock_llm_provider.generate.call_args
-        messages_sent = call_args[0][0] if call_args else []
+        prompt_sent = mock_llm_provider.calls[0][0] if mock_llm_provider.calls else ""
         
         # Should include system prompt + history + new message
-        assert len(messages_sent) >= 3
-        mock_llm_provider.generate.assert_called_once()
+        assert "Previous question" in prompt_sent
+        assert "Previous answer" in prompt_sent
+        assert "New question" in prompt_sent
+        assert len(mock_llm_provider.calls) == 1
     
-    @pytest.mark.asyncio
     async def test_chat_with_document_context(
         self,
         chat_service,
@@ -135,9 +153,8 @@ class TestChatService:
         # Verify response was generated
         assert response.conversation_id is not None
         assert response.message.content == "Question about documents"
-        mock_llm_provider.generate.assert_called_once()
+        assert len(mock_llm_provider.calls) == 1
     
-    @pytest.mark.asyncio
     async def test_chat_generates_title_for_new_conversation(
         self,
         chat_service,
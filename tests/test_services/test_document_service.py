@@ -1,11 +1,11 @@
 """Tests for DocumentService"""
 
 import pytest
-from unittest.mock import MagicMock, AsyncMock
+from unittest.mock import MagicMock
 from io import BytesIO
 
 from src.services.document_service import DocumentService
-from src.models.database import Document
+from src.models.database import Document, Project
 
 
 @pytest.mark.unit
@@ -13,19 +13,25 @@ class TestDocumentService:
     """Test suite for DocumentService"""
     
     @pytest.fixture
-    def document_service(self, document_repo, mock_vector_store):
+    def mock_text_extractor(self):
+        """Stand-in for text extraction that returns canned text"""
+        return MagicMock(return_value="Parsed document text")
+    
+    @pytest.fixture
+    def document_service(self, document_repo, mock_vector_store, mock_text_extractor):
         """Create DocumentService with mocked dependencies"""
         return DocumentService(
             document_repo=document_repo,
-            vector_store=mock_vector_store
+            vector_store=mock_vector_store,
+            text_extractor=mock_text_extractor
         )
     
-    @pytest.mark.asyncio
     async def test_upload_document_success(
         self,
         document_service,
         test_project,
-        mock_vector_store
+        mock_vector_store,
+        mock_text_extractor
     ):
         """Test successful document upload"""
         file_content = b"Test PDF content"
@@ -42,6 +48,8 @@ class TestDocumentService:
         assert document.filename == "test.pdf"
         assert document.project_id == test_project.id
         assert document.file_size == len(file_content)
+        mock_text_extractor.assert_called_once_with(file_content, "application/pdf", "test.pdf")
+        mock_vector_store.add_documents.assert_awaited_once()
     
     def test_get_project_documents(
         self,
@@ -63,7 +71,6 @@ class TestDocumentService:
         """Test that get_document method might not exist"""
         # DocumentService might not have get_document method
         # Just verify the document repo works
-        from src.repositories.document_repository import DocumentRepository
         assert test_document.id is not None
     
     def test_delete_document_via_repo(
@@ -81,7 +88,7 @@ class TestDocumentService:
             file_path="/tmp/to_delete.pdf"
         )
         test_db.add(doc)
-        test_db.commit()
+        test_db.flush()
         doc_id = doc.id
         
         # Delete via repo (service might not have delete method)
@@ -89,7 +96,6 @@ class TestDocumentService:
         
         assert result is True
     
-    @pytest.mark.asyncio
     async def test_search_documents_basic(
         self,
         document_service,
@@ -107,14 +113,12 @@ class TestDocumentService:
         test_user
     ):
         """Test listing documents for project with no documents"""
-        from src.models.database import Project
-        
         empty_project = Project(
             user_id=test_user.id,
             name="Empty Project"
         )
         test_db.add(empty_project)
-        test_db.commit()
+        test_db.flush()
         
         documents = document_service.get_project_documents(empty_project.id)
         
@@ -28,8 +28,7 @@ class TestExportService:
     def test_get_conversation_messages(
         self,
         export_service,
-        test_conversation,
-        test_db
+        test_conversation
     ):
         """Test getting messages for export"""
         # Add some messages
@@ -47,9 +46,7 @@ class TestExportService:
                 message_type="text"
             ),
         ]
-        for msg in messages:
-            test_db.add(msg)
-        test_db.commit()
+        export_service.message_repo.bulk_create(messages)
         
         # Get messages via repo
         retrieved_messages = export_service.message_repo.find_by_conversation(test_conversation.id)
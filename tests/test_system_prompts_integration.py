@@ -9,6 +9,9 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import asyncio
+import logging
+from typing import Optional, Tuple
+from sqlalchemy.orm import Session
 from src.models.database import SessionLocal, Project
 from src.repositories.project_repository import ProjectRepository
 from src.services.chat_service import ChatService
@@ -16,13 +19,22 @@ from src.repositories.conversation_repository import ConversationRepository
 from src.repositories.message_repository import MessageRepository
 from src.models.schemas import ChatRequest
 
+logger = logging.getLogger(__name__)
 
-def test_database_column_exists():
+
+def _open_session(db: Optional[Session]) -> Tuple[Session, bool]:
+    """Reuse the caller's session, or open one; the flag says whether we own it"""
+    if db is not None:
+        return db, False
+    return SessionLocal(), True
+
+
+def test_database_column_exists(db: Optional[Session] = None):
     """Test 1: Verify system_prompt column exists in database"""
-    print("\n📋 Test 1: Database Column")
-    print("=" * 50)
+    logger.info("📋 Test 1: Database Column")
+    logger.info("=" * 50)
     
-    db = SessionLocal()
+    db, owns_session = _open_session(db)
     try:
         # Create test project with system prompt
         test_project = Project(
@@ -38,29 +50,30 @@ def test_database_column_exists():
         
         # Verify it was saved
         assert test_project.system_prompt == "You are a test assistant."
-        print(f"✅ Project created with ID: {test_project.id}")
-        print(f"✅ System prompt saved: {test_project.system_prompt[:50]}...")
+        logger.info("✅ Project created with ID: %s", test_project.id)
+        logger.info("✅ System prompt saved: %s...", test_project.system_prompt[:50])
         
         # Clean up
         db.delete(test_project)
         db.commit()
-        print("✅ Test passed: Database column exists and works")
+        logger.info("✅ Test passed: Database column exists and works")
         return True
         
     except Exception as e:
-        print(f"❌ Test failed: {e}")
+        logger.error("❌ Test failed: %s", e)
         db.rollback()
         return False
     finally:
-        db.close()
+        if owns_session:
+            db.close()
 
 
-def test_project_repository():
+def test_project_repository(db: Optional[Session] = None):
     """Test 2: Verify ProjectRepository retrieves system prompt"""
-    print("\n📋 Test 2: Project Repository")
-    print("=" * 50)
+    logger.info("📋 Test 2: Project Repository")
+    logger.info("=" * 50)
     
-    db = SessionLocal()
+    db, owns_session = _open_session(db)
     try:
         repo = ProjectRepository(db)
         
@@ -73,32 +86,34 @@ def test_project_repository():
             system_prompt="You are a repository test assistant."
         )
         created = repo.create(test_project)
-        print(f"✅ Project created with ID: {created.id}")
+        logger.info("✅ Project created with ID: %s", created.id)
         
         # Retrieve using find_by_id
         retrieved = repo.find_by_id(created.id)
         assert retrieved is not None
         assert retrieved.system_prompt == "You are a repository test assistant."
-        print(f"✅ Retrieved system prompt: {retrieved.system_prompt[:50]}...")
+        logger.info("✅ Retrieved system prompt: %s...", retrieved.system_prompt[:50])
         
         # Clean up
         repo.delete(created.id)
-        print("✅ Test passed: Repository correctly retrieves system prompt")
+        logger.info("✅ Test passed: Repository correctly retrieves system prompt")
         return True
         
     except Exception as e:
-        print(f"❌ Test failed: {e}")
+        logger.error("❌ Test failed: %s", e)
+        db.rollback()
         return False
     finally:
-        db.close()
+        if owns_session:
+            db.close()
 
 
-async def test_chat_service_system_prompt():
+async def test_chat_service_system_prompt(db: Optional[Session] = None):
     """Test 3: Verify ChatService uses system prompt in prompt building"""
-    print("\n📋 Test 3: Chat Service Integration")
-    print("=" * 50)
+    logger.info("📋 Test 3: Chat Service Integration")
+    logger.info("=" * 50)
     
-    db = SessionLocal()
+    db, owns_session = _open_session(db)
     try:
         # Create test project with system prompt
         project_repo = ProjectRepository(db)
@@ -110,33 +125,35 @@ async def test_chat_service_system_prompt():
             system_prompt="You are a friendly test assistant who always says 'TESTING MODE' in responses."
         )
         created_project = project_repo.create(test_project)
-        print(f"✅ Test project created with ID: {created_project.id}")
-        print(f"✅ System prompt: {created_project.system_prompt[:80]}...")
+        logger.info("✅ Test project created with ID: %s", created_project.id)
+        logger.info("✅ System prompt: %s...", created_project.system_prompt[:80])
         
         # Note: We can't test full LLM integration without mocking
         # But we can verify the system prompt is retrieved
         retrieved = project_repo.find_by_id(created_project.id)
         assert retrieved.system_prompt is not None
-        print("✅ ChatService will use system prompt:", retrieved.system_prompt[:50] + "...")
+        logger.info("✅ ChatService will use system prompt: %s...", retrieved.system_prompt[:50])
         
         # Clean up
         project_repo.delete(created_project.id)
-        print("✅ Test passed: ChatService can access system prompt")
+        logger.info("✅ Test passed: ChatService can access system prompt")
         return True
         
     except Exception as e:
-        print(f"❌ Test failed: {e}")
+        logger.error("❌ Test failed: %s", e)
+        db.rollback()
         return False
     finally:
-        db.close()
+        if owns_session:
+            db.close()
 
 
-def test_system_prompt_optional():
+def test_system_prompt_optional(db: Optional[Session] = None):
     """Test 4: Verify system prompt is optional (can be NULL)"""
-    print("\n📋 Test 4: Optional System Prompt")
-    print("=" * 50)
+    logger.info("📋 Test 4: Optional System Prompt")
+    logger.info("=" * 50)
     
-    db = SessionLocal()
+    db, owns_session = _open_session(db)
     try:
         repo = ProjectRepository(db)
         
@@ -149,31 +166,33 @@ def test_system_prompt_optional():
             system_prompt=None
         )
         created = repo.create(test_project)
-        print(f"✅ Project created without system prompt, ID: {created.id}")
+        logger.info("✅ Project created without system prompt, ID: %s", created.id)
         
         # Verify it's None
         retrieved = repo.find_by_id(created.id)
         assert retrieved.system_prompt is None
-        print("✅ System prompt is None (as expected)")
+        logger.info("✅ System prompt is None (as expected)")
         
         # Clean up
         repo.delete(created.id)
-        print("✅ Test passed: System prompt is optional")
+        logger.info("✅ Test passed: System prompt is optional")
         return True
         
     except Exception as e:
-        print(f"❌ Test failed: {e}")
+        logger.error("❌ Test failed: %s", e)
+        db.rollback()
         return False
     finally:
-        db.close()
+        if owns_session:
+            db.close()
 
 
-def test_update_system_prompt():
+def test_update_system_prompt(db: Optional[Session] = None):
     """Test 5: Verify system prompt can be updated"""
-    print("\n📋 Test 5: Update System Prompt")
-    print("=" * 50)
+    logger.info("📋 Test 5: Update System Prompt")
+    logger.info("=" * 50)
     
-    db = SessionLocal()
+    db, owns_session = _open_session(db)
     try:
         repo = ProjectRepository(db)
         
@@ -186,28 +205,30 @@ def test_update_system_prompt():
             system_prompt="Initial prompt"
         )
         created = repo.create(test_project)
-        print(f"✅ Project created with initial prompt: {created.system_prompt}")
+        logger.info("✅ Project created with initial prompt: %s", created.system_prompt)
         
         # Update system prompt
         created.system_prompt = "Updated prompt - testing modifications"
         updated = repo.update(created)
-        print(f"✅ System prompt updated: {updated.system_prompt}")
+        logger.info("✅ System prompt updated: %s", updated.system_prompt)
         
         # Verify update persisted
         retrieved = repo.find_by_id(created.id)
         assert retrieved.system_prompt == "Updated prompt - testing modifications"
-        print("✅ Update persisted in database")
+        logger.info("✅ Update persisted in database")
         
         # Clean up
         repo.delete(created.id)
-        print("✅ Test passed: System prompt can be updated")
+        logger.info("✅ Test passed: System prompt can be updated")
         return True
         
     except Exception as e:
-        print(f"❌ Test failed: {e}")
+        logger.error("❌ Test failed: %s", e)
+        db.rollback()
         return False
     finally:
-        db.close()
+        if owns_session:
+            db.close()
 
 
 def run_all_tests():
@@ -218,15 +239,19 @@ def run_all_tests():
     
     results = []
     
-    # Run synchronous tests
-    results.append(("Database Column", test_database_column_exists()))
-    results.append(("Project Repository", test_project_repository()))
-    results.append(("Optional Prompt", test_system_prompt_optional()))
-    results.append(("Update Prompt", test_update_system_prompt()))
-    
-    # Run async test
-    loop = asyncio.get_event_loop()
-    results.append(("Chat Service", loop.run_until_complete(test_chat_service_system_prompt())))
+    # One session shared by every test instead of one per test
+    db = SessionLocal()
+    try:
+        # Run synchronous tests
+        results.append(("Database Column", test_database_column_exists(db)))
+        results.append(("Project Repository", test_project_repository(db)))
+        results.append(("Optional Prompt", test_system_prompt_optional(db)))
+        results.append(("Update Prompt", test_update_system_prompt(db)))
+        
+        # Run async test
+        results.append(("Chat Service", asyncio.run(test_chat_service_system_prompt(db))))
+    finally:
+        db.close()
     
     # Summary
     print("\n" + "=" * 50)
@@ -254,5 +279,10 @@ def run_all_tests():
 
 
 if __name__ == "__main__":
+    # Per-step progress only with -v; the summary is always printed
+    logging.basicConfig(
+        level=logging.INFO if "-v" in sys.argv[1:] else logging.WARNING,
+        format="%(message)s",
+    )
     success = run_all_tests()
     sys.exit(0 if success else 1)
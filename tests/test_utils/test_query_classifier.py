@@ -0,0 +1,106 @@
+"""Tests for query classifier utility"""
+
+import pytest
+from src.utils.query_classifier import (
+    QueryType,
+    ToolRequirement,
+    classify_query,
+    classify_query_with_target,
+    detect_url,
+    detect_url_patterns,
+    extract_from_match,
+    extract_url_or_domain,
+)
+
+
+@pytest.mark.unit
+class TestQueryClassifier:
+    """Test suite for query classification utilities"""
+
+    def test_detect_url_patterns_full_url(self):
+        """Test detecting URLs with protocol"""
+        assert detect_url_patterns("Check https://example.com/page") is True
+        assert detect_url_patterns("Check HTTP://Example.com") is True
+
+    def test_detect_url_patterns_www_and_domains(self):
+        """Test detecting www. prefixes and bare domains"""
+        assert detect_url_patterns("visit www.example.org") is True
+        assert detect_url_patterns("what is zapagi.com") is True
+        assert detect_url_patterns("look at user.github.io") is True
+
+    def test_detect_url_patterns_ignores_common_words(self):
+        """Test that plain English is not treated as a domain"""
+        assert detect_url_patterns("I already finished the homework") is False
+        assert detect_url_patterns("Explain photosynthesis") is False
+
+    def test_extract_url_or_domain(self):
+        """Test extracting the search target from a message"""
+        assert extract_url_or_domain("Check https://example.com/docs/") == "example.com/docs"
+        assert extract_url_or_domain("visit www.Example.org today") == "Example.org"
+        assert extract_url_or_domain("what is zapagi.com?") == "zapagi.com"
+        # Short names and TLDs that detection skips are still extracted
+        assert extract_url_or_domain("check x.co for me") == "x.co"
+        assert extract_url_or_domain("look at foo.me") == "foo.me"
+        assert extract_url_or_domain("visit example.app please") == "example.app"
+        assert extract_url_or_domain("what is on ab.com") == "ab.com"
+        assert extract_url_or_domain("no links here") == "no links here"
+
+    def test_extract_from_match_reuses_detection(self):
+        """Test that extraction slices the match returned by detection"""
+        message = "tell me about User.GitHub.io"
+        url_match = detect_url(message.lower())
+
+        assert url_match is not None
+        assert extract_from_match(url_match, message) == "User.GitHub.io"
+        assert extract_from_match(None, "no links here") == "no links here"
+
+    def test_classify_query_url_lookup(self):
+        """Test URL queries require web search"""
+        assert classify_query("Summarize https://example.com") == (
+            QueryType.URL_LOOKUP, ToolRequirement.REQUIRED
+        )
+
+    def test_classify_query_with_target(self):
+        """Test classification returns the URL search target from the same scan"""
+        assert classify_query_with_target("Summarize https://Example.com/docs/") == (
+            (QueryType.URL_LOOKUP, ToolRequirement.REQUIRED), "Example.com/docs"
+        )
+        assert classify_query_with_target("Explain photosynthesis") == (
+            (QueryType.GENERAL_KNOWLEDGE, ToolRequirement.OPTIONAL), None
+        )
+
+    def test_classify_query_categories(self):
+        """Test keyword-based query categories"""
+        assert classify_query("Search for black holes")[0] == QueryType.WEB_SEARCH_REQUIRED
+        assert classify_query("What happened today?")[0] == QueryType.CURRENT_EVENTS
+        assert classify_query("What is 12 * 7?")[0] == QueryType.CALCULATION
+        assert classify_query("Write a story about dragons")[0] == QueryType.CREATIVE
+        assert classify_query("Explain photosynthesis") == (
+            QueryType.GENERAL_KNOWLEDGE, ToolRequirement.OPTIONAL
+        )
+
+    def test_classify_query_matches_whole_words(self):
+        """Test single-word indicators don't match inside other words"""
+        assert classify_query("I know the answer")[0] == QueryType.GENERAL_KNOWLEDGE
+        assert classify_query("What happened recently?")[0] == QueryType.CURRENT_EVENTS
+        assert classify_query("News from this week")[0] == QueryType.CURRENT_EVENTS
+
+    @pytest.mark.parametrize("message", [
+        "Imagine a world without cars",
+        "She imagined a city on Mars",
+        "He imagines the ocean floor",
+        "Brainstorm names for my cat",
+        "The team brainstormed slogans",
+        "Our group brainstorms weekly",
+    ])
+    def test_classify_query_creative_inflections(self, message):
+        """Test inflected creative keywords still classify as creative"""
+        assert classify_query(message) == (QueryType.CREATIVE, ToolRequirement.NONE)
+
+    def test_classify_query_long_message(self):
+        """Test messages past the cache length limit classify the same way"""
+        message = "Explain photosynthesis in detail. " * 20
+
+        assert len(message) > 512
+        assert classify_query(message) == (QueryType.GENERAL_KNOWLEDGE, ToolRequirement.OPTIONAL)
+        assert classify_query(message + " https://example.com")[0] == QueryType.URL_LOOKUP
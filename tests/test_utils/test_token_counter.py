@@ -1,8 +1,10 @@
 """Tests for token counter utility"""
 
 import pytest
+from src.utils import token_counter
 from src.utils.token_counter import (
     estimate_tokens,
+    estimate_tokens_batch,
     get_context_window_limit,
     calculate_context_usage
 )
@@ -12,23 +14,16 @@ from src.utils.token_counter import (
 class TestTokenCounter:
     """Test suite for token counting utilities"""
     
-    def test_estimate_tokens_simple_text(self):
-        """Test estimating tokens in simple text"""
-        text = "Hello world"
+    @pytest.mark.parametrize("text,min_count", [
+        ("Hello world", 2),
+        ("This is a longer piece of text that should have more tokens than just a few words.", 11),
+    ])
+    def test_estimate_tokens_text(self, text, min_count):
+        """Test estimating tokens in simple and longer text"""
         count = estimate_tokens(text)
         
-        assert count > 0
-        assert isinstance(count, int)
-        # Should estimate some tokens
-        assert count >= 2
-    
-    def test_estimate_tokens_longer_text(self):
-        """Test estimating tokens in longer text"""
-        text = "This is a longer piece of text that should have more tokens than just a few words."
-        count = estimate_tokens(text)
-        
-        assert count > 10
-        assert isinstance(count, int)
+        assert count >= min_count
+        assert type(count) is int
     
     def test_estimate_tokens_empty_string(self):
         """Test estimating tokens for empty string"""
@@ -36,17 +31,91 @@ class TestTokenCounter:
         
         assert count == 0
     
-    def test_get_context_window_limit_known_models(self):
-        """Test getting context window limits for known models"""
-        assert get_context_window_limit("gpt-4") == 8192
-        assert get_context_window_limit("gpt-3.5-turbo") == 4096
-        assert get_context_window_limit("llama3") == 8192
+    def test_estimate_tokens_uses_encoder(self, mocker):
+        """Test token count comes from the BPE encoder when available"""
+        encoding = mocker.MagicMock()
+        encoding.encode_ordinary.return_value = [1, 2, 3]
+        mocker.patch("src.utils.token_counter._get_encoding", return_value=encoding)
+        
+        assert estimate_tokens("Hello world") == 3
+    
+    def test_estimate_tokens_fallback_without_encoder(self, mocker):
+        """Test character-based estimate is used when tiktoken is unavailable"""
+        mocker.patch("src.utils.token_counter._get_encoding", return_value=None)
+        
+        # 400 chars -> 100 tokens + 10 token buffer
+        assert estimate_tokens("a" * 400) == 110
+    
+    def test_failed_encoding_load_is_retried(self, mocker):
+        """Test a failed load falls back for now but is retried after the interval"""
+        mocker.patch.dict(token_counter._ENCODINGS, clear=True)
+        mocker.patch.dict(token_counter._last_load_failure, clear=True)
+        encoding = mocker.MagicMock()
+        load = mocker.patch("src.utils.token_counter._load_encoding", side_effect=[None, encoding])
+        clock = mocker.patch("src.utils.token_counter.time.monotonic", return_value=1000.0)
+        
+        assert token_counter._get_encoding("default") is None
+        # Within the retry interval the failure is not re-attempted
+        assert token_counter._get_encoding("default") is None
+        assert load.call_count == 1
+        
+        clock.return_value = 1000.0 + token_counter._LOAD_RETRY_SECONDS
+        assert token_counter._get_encoding("default") is encoding
+        # Successful loads are cached
+        assert token_counter._get_encoding("default") is encoding
+        assert load.call_count == 2
+    
+    def test_preload_encoding(self, mocker):
+        """Test preloading reports whether the encoding is available"""
+        mocker.patch.dict(token_counter._ENCODINGS, clear=True)
+        mocker.patch.dict(token_counter._last_load_failure, clear=True)
+        mocker.patch("src.utils.token_counter._load_encoding", return_value=mocker.MagicMock())
+        
+        assert token_counter.preload_encoding() is True
+        assert "default" in token_counter._ENCODINGS
+    
+    def test_estimate_tokens_batch_matches_single(self):
+        """Test batch counting agrees with per-text counting"""
+        texts = ["Hello world", "", "This is a longer piece of text with more tokens."]
+        counts = estimate_tokens_batch(texts)
+        
+        assert counts == [estimate_tokens(text) for text in texts]
+    
+    def test_estimate_tokens_batch_parallel_only_for_long_batches(self, mocker):
+        """Test short batches skip the thread pool and long ones cap its size"""
+        encoding = mocker.MagicMock()
+        encoding.encode_ordinary.return_value = [1, 2]
+        encoding.encode_ordinary_batch.side_effect = lambda texts, num_threads: [[1, 2]] * len(texts)
+        mocker.patch("src.utils.token_counter._get_encoding", return_value=encoding)
+        
+        assert estimate_tokens_batch(["hi"] * 3) == [2, 2, 2]
+        encoding.encode_ordinary_batch.assert_not_called()
+        
+        texts = ["hi"] * token_counter._BATCH_PARALLEL_MIN_TEXTS
+        assert estimate_tokens_batch(texts) == [2] * len(texts)
+        encoding.encode_ordinary_batch.assert_called_once_with(
+            texts, num_threads=token_counter._BATCH_MAX_THREADS
+        )
     
-    def test_get_context_window_limit_unknown_model(self):
-        """Test getting context window limit for unknown model"""
-        limit = get_context_window_limit("unknown-model")
+    def test_estimate_tokens_batch_fallback(self, mocker):
+        """Test batch fallback matches the character-based estimate"""
+        mocker.patch("src.utils.token_counter._get_encoding", return_value=None)
         
-        assert limit == 8192  # Should return default
+        assert estimate_tokens_batch(["a" * 400, "", "hi"]) == [110, 0, 10]
+    
+    @pytest.mark.parametrize("model,expected", [
+        ("gpt-4", 8192),
+        ("gpt-3.5-turbo", 4096),
+        ("llama3", 8192),
+        # Matched regardless of case
+        ("GPT-4-32K", 32768),
+        ("Llama2", 4096),
+        # Unknown models get the default
+        ("unknown-model", 8192),
+    ])
+    def test_get_context_window_limit(self, model, expected):
+        """Test getting context window limits by model name"""
+        assert get_context_window_limit(model) == expected
     
     def test_calculate_context_usage_basic(self):
         """Test calculating context usage"""
@@ -56,11 +125,10 @@ class TestTokenCounter:
             document_context_tokens=500
         )
         
-        assert usage["total_tokens"] == 1600
-        assert usage["max_tokens"] == 8192
-        assert usage["remaining_tokens"] > 0
-        assert "usage_percentage" in usage
-        assert isinstance(usage["usage_percentage"], (int, float))
+        assert usage.total_tokens == 1600
+        assert usage.max_tokens == 8192
+        assert usage.remaining_tokens > 0
+        assert type(usage.usage_percentage) in (int, float)
     
     def test_calculate_context_usage_near_limit(self):
         """Test detecting near limit usage"""
@@ -69,7 +137,7 @@ class TestTokenCounter:
             system_prompt_tokens=500
         )
         
-        assert usage["is_near_limit"] is True
+        assert usage.is_near_limit is True
     
     def test_calculate_context_usage_below_limit(self):
         """Test usage below limit"""
@@ -77,4 +145,13 @@ class TestTokenCounter:
             messages_tokens=1000
         )
         
-        assert usage["is_near_limit"] is False
+        assert usage.is_near_limit is False
+    
+    def test_calculate_context_usage_as_dict(self):
+        """Test converting usage stats to a plain dict"""
+        usage = calculate_context_usage(messages_tokens=4096)
+        data = usage._asdict()
+        
+        assert data["total_tokens"] == 4096
+        assert data["usage_percentage"] == 50.0
+        assert data["is_near_limit"] is False